@@ -0,0 +1,68 @@
+"""
+Compare the xml engines for parsing worksheets
+
+python parser.py [workbook]
+"""
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+from zipfile import ZipFile
+
+from openpyxl.compat import BytesIO
+from openpyxl.workbook import Workbook
+from openpyxl.worksheet import Worksheet
+from openpyxl.worksheet.iter_worksheet import read_values
+from openpyxl.worksheet.tokenizer import iter_rows
+from openpyxl.reader.worksheet import fast_parse
+from openpyxl.xml.functions import ENGINES
+
+
+def sheet_xml(filename):
+    """Uncompressed xml of the first worksheet"""
+    archive = ZipFile(filename)
+    try:
+        return archive.read('xl/worksheets/sheet1.xml')
+    finally:
+        archive.close()
+
+
+def parse_rows(xml, engine):
+    """Only the tokenizer, rows of raw strings are thrown away"""
+    for row in iter_rows(BytesIO(xml), engine):
+        pass
+
+
+def parse_values(xml, engine):
+    """Read-only mode, values without cells"""
+    for row in read_values(BytesIO(xml), 1, 1, None, None, None,
+                           frozenset(), None, engine=engine):
+        pass
+
+
+def parse_worksheet(xml, engine):
+    """Standard mode, a complete worksheet"""
+    ws = Worksheet(Workbook())
+    fast_parse(ws, BytesIO(xml), {}, {}, engine=engine)
+
+
+def timer(xml, fn, engine):
+    """Best of three"""
+    times = timeit.repeat(lambda: fn(xml, engine), number=1, repeat=3)
+    return min(times)
+
+
+if __name__ == "__main__":
+    folder = os.path.split(__file__)[0]
+    if len(sys.argv) > 1:
+        src = sys.argv[1]
+    else:
+        src = os.path.join(folder, "files", "very_large.xlsx")
+    xml = sheet_xml(src)
+    engines = sorted(ENGINES)
+    print("{0:<16}".format(""), "".join("{0:>10}".format(e) for e in engines))
+    for fn in (parse_rows, parse_values, parse_worksheet):
+        results = [timer(xml, fn, engine) for engine in engines]
+        print("{0:<16}".format(fn.__name__),
+              "".join("{0:>9.2f}s".format(r) for r in results))
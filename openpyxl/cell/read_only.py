@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 # Copyright (c) 2010-2014 openpyxl
 
+from array import array
 
 from openpyxl.compat import unicode
 from openpyxl.date_time import from_excel
@@ -8,12 +9,35 @@ from openpyxl.styles import is_date_format
 from .cell import Cell, get_column_letter
 
 
+def date_style_flags(style_table):
+    """
+    Flags indexed by style id: 1 if numbers with the style are dates,
+    0 otherwise. Computed once per workbook so that cells need only look up
+    their style id.
+    """
+    flags = array('b')
+    if style_table:
+        flags.extend([0] * (max(style_table) + 1))
+        for idx, style in style_table.items():
+            if is_date_format(style.number_format.format_code):
+                flags[idx] = 1
+    return flags
+
+
 class ReadOnlyCell(object):
+    """
+    Cell from a read-only worksheet.
 
-    __slots__ = ('row', 'column', '_value', 'data_type', '_style_id')
+    Shared strings, styles, date style flags and the base date are looked up
+    through the worksheet (`parent`) so that several workbooks can be read at
+    once.
+    """
 
+    __slots__ = ('parent', 'row', 'column', '_value', 'data_type', '_style_id')
 
-    def __init__(self, row, column, value, data_type=Cell.TYPE_NULL, style_id=None):
+
+    def __init__(self, sheet, row, column, value, data_type=Cell.TYPE_NULL, style_id=None):
+        self.parent = sheet
         self.row = row
         self.column = column
         self.data_type = data_type
@@ -29,17 +53,17 @@ class ReadOnlyCell(object):
     def __ne__(self, other):
         return not self.__eq__(other)
 
-    @classmethod
-    def set_string_table(cls, string_table):
-        cls.string_table = string_table
+    @property
+    def string_table(self):
+        return self.parent.string_table
 
-    @classmethod
-    def set_style_table(cls, style_table):
-        cls.style_table = style_table
+    @property
+    def style_table(self):
+        return self.parent.style_table
 
-    @classmethod
-    def set_base_date(cls, base_date):
-        cls.base_date = base_date
+    @property
+    def base_date(self):
+        return self.parent.base_date
 
     @property
     def coordinate(self):
@@ -49,7 +73,9 @@ class ReadOnlyCell(object):
 
     @property
     def is_date(self):
-        return self.data_type == Cell.TYPE_NUMERIC and is_date_format(self.number_format)
+        return (self.data_type == Cell.TYPE_NUMERIC
+                and self._style_id is not None
+                and self.parent.date_styles[self._style_id] == 1)
 
     @property
     def number_format(self):
@@ -73,17 +99,21 @@ class ReadOnlyCell(object):
 
     @property
     def value(self):
-        if self._value is None:
+        value = self._value
+        if value is None:
             return
-        if self.data_type == Cell.TYPE_BOOL:
-            return self._value == '1'
-        elif self.is_date:
-            return from_excel(self._value, self.base_date)
-        elif self.data_type in(Cell.TYPE_INLINE, Cell.TYPE_FORMULA_CACHE_STRING):
-            return unicode(self._value)
-        elif self.data_type == Cell.TYPE_STRING:
-            return unicode(self.string_table[int(self._value)])
-        return self._value
+        data_type = self.data_type
+        if data_type == Cell.TYPE_NUMERIC:
+            if self._style_id is not None and self.parent.date_styles[self._style_id]:
+                return from_excel(value, self.parent.base_date)
+            return value
+        elif data_type == Cell.TYPE_STRING:
+            return unicode(self.parent.string_table[int(value)])
+        elif data_type == Cell.TYPE_BOOL:
+            return value == '1'
+        elif data_type in (Cell.TYPE_INLINE, Cell.TYPE_FORMULA_CACHE_STRING):
+            return unicode(value)
+        return value
 
     def _set_value(self, value):
         if value is None:
@@ -92,4 +122,4 @@ class ReadOnlyCell(object):
             value = float(value)
         self._value = value
 
-EMPTY_CELL = ReadOnlyCell(None, None, None)
+EMPTY_CELL = ReadOnlyCell(None, None, None, None)
@@ -7,7 +7,7 @@ from openpyxl.cell.read_only import ReadOnlyCell
 
 
 def test_ctor():
-    cell = ReadOnlyCell(None, None, 10, 'n')
+    cell = ReadOnlyCell(None, None, None, 10, 'n')
     assert cell.value == 10
 
 
@@ -17,29 +17,42 @@ def test_empty_cell():
     assert EMPTY_CELL.data_type == 's'
 
 
+class DummySheet(object):
+
+    def __init__(self, string_table=None, style_table=None, base_date=2415018.5):
+        from openpyxl.cell.read_only import date_style_flags
+        self.string_table = string_table
+        self.style_table = style_table
+        self.date_styles = date_style_flags(style_table)
+        self.base_date = base_date
+
+
 def test_base_date():
-    ReadOnlyCell.set_base_date(2415018.5)
-    cell = ReadOnlyCell(None, None, 10, 'n')
+    cell = ReadOnlyCell(DummySheet(base_date=2415018.5), None, None, 10, 'n')
     assert cell.base_date == 2415018.5
 
 
 def test_style_table():
-    ReadOnlyCell.set_style_table({})
-    cell = ReadOnlyCell(None, None, 10, 'n')
+    cell = ReadOnlyCell(DummySheet(style_table={}), None, None, 10, 'n')
     assert cell.style_table == {}
 
 
 def test_string_table():
-    ReadOnlyCell.set_string_table({1:'Hello world'})
-    cell = ReadOnlyCell(None, None, 1, 's')
+    cell = ReadOnlyCell(DummySheet({1:'Hello world'}), None, None, 1, 's')
     assert cell.string_table == {1:'Hello world'}
     assert cell.value == 'Hello world'
 
 
+def test_separate_tables():
+    c1 = ReadOnlyCell(DummySheet({1:'Hello'}), None, None, 1, 's')
+    c2 = ReadOnlyCell(DummySheet({1:'world'}), None, None, 1, 's')
+    assert (c1.value, c2.value) == ('Hello', 'world')
+
+
 def test_coordinate():
-    cell = ReadOnlyCell(1, "A", 10, None)
+    cell = ReadOnlyCell(None, 1, "A", 10, None)
     assert cell.coordinate == "A1"
-    cell = ReadOnlyCell(None, None, 1, None)
+    cell = ReadOnlyCell(None, None, None, 1, None)
     with pytest.raises(AttributeError):
         cell.coordinate
 
@@ -50,19 +63,19 @@ def test_coordinate():
                          ('0', False),
                          ])
 def test_bool(value, expected):
-    cell = ReadOnlyCell(None, None, value, 'b')
+    cell = ReadOnlyCell(None, None, None, value, 'b')
     assert cell.value is expected
 
 
 def test_inline_String():
-    cell = ReadOnlyCell(None, None, "Hello World!", 'inlineStr')
+    cell = ReadOnlyCell(None, None, None, "Hello World!", 'inlineStr')
     assert cell.value == "Hello World!"
 
 
 def test_numeric():
-    cell = ReadOnlyCell(None, None, "24555", 'n')
+    cell = ReadOnlyCell(None, None, None, "24555", 'n')
     assert cell.value == 24555
-    cell = ReadOnlyCell(None, None, None, 'n')
+    cell = ReadOnlyCell(None, None, None, None, 'n')
     assert cell.value is None
 
 
@@ -78,11 +91,16 @@ def DummyCell():
         number_format = DummyNumberFormat()
 
     style_table = {1:DummyStyle()}
-    cell = ReadOnlyCell(None, None, "23596", 'n', '1')
-    cell.set_style_table(style_table)
+    cell = ReadOnlyCell(DummySheet(style_table=style_table), None, None, "23596", 'n', '1')
     return cell
 
 
+def test_date_style_flags(DummyCell):
+    from openpyxl.cell.read_only import date_style_flags
+    assert date_style_flags(DummyCell.style_table).tolist() == [0, 1]
+    assert len(date_style_flags({})) == 0
+
+
 class TestDateTime:
 
     def test_number_format(self, DummyCell):
@@ -99,7 +117,7 @@ class TestDateTime:
 
 
 def test_read_only():
-    cell = ReadOnlyCell(None, None, 1, None)
+    cell = ReadOnlyCell(None, None, None, 1, None)
     with pytest.raises(AttributeError):
         cell.value = 10
     with pytest.raises(AttributeError):
@@ -107,9 +125,9 @@ def test_read_only():
 
 
 def test_equality():
-    c1 = ReadOnlyCell(None, None, 10, None)
-    c2 = ReadOnlyCell(None, None, 10, None)
+    c1 = ReadOnlyCell(None, None, None, 10, None)
+    c2 = ReadOnlyCell(None, None, None, 10, None)
     assert c1 is not c2
     assert c1 == c2
-    c3 = ReadOnlyCell(None, None, 5, None)
+    c3 = ReadOnlyCell(None, None, None, 5, None)
     assert c3 != c1
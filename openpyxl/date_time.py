@@ -30,14 +30,9 @@ from __future__ import division
 import datetime
 import re
 import warnings
+from math import floor
 
-from jdcal import (
-    gcal2jd,
-    jd2gcal,
-    MJD_0
-)
-
-from openpyxl.compat import lru_cache
+from jdcal import gcal2jd
 
 # constants
 MAC_EPOCH = datetime.date(1904, 1, 1)
@@ -46,6 +41,12 @@ CALENDAR_WINDOWS_1900 = sum(gcal2jd(WINDOWS_EPOCH.year, WINDOWS_EPOCH.month, WIN
 CALENDAR_MAC_1904 = sum(gcal2jd(MAC_EPOCH.year, MAC_EPOCH.month, MAC_EPOCH.day))
 SECS_PER_DAY = 86400
 
+# day 0 of each calendar, to convert serial dates without going via julian days
+EPOCHS = {
+    CALENDAR_WINDOWS_1900: datetime.datetime(1899, 12, 30),
+    CALENDAR_MAC_1904: datetime.datetime(1904, 1, 1),
+}
+
 EPOCH = datetime.datetime.utcfromtimestamp(0)
 W3CDTF_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 W3CDTF_REGEX = re.compile('(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(.(\d{2}))?Z?')
@@ -101,25 +102,84 @@ class SharedDate(object):
     def from_julian(self, value=0):
         return from_excel(value, self.excel_base_date)
 
-@lru_cache()
+def _epoch(offset):
+    """Date of day 0 for a base date given as a julian day"""
+    try:
+        return EPOCHS[offset]
+    except KeyError:
+        return EPOCHS[CALENDAR_WINDOWS_1900] + datetime.timedelta(days=offset - CALENDAR_WINDOWS_1900)
+
+
 def to_excel(dt, offset=CALENDAR_WINDOWS_1900):
-    jul = sum(gcal2jd(dt.year, dt.month, dt.day)) - offset
+    epoch = _epoch(offset)
+    jul = float(datetime.date(dt.year, dt.month, dt.day).toordinal() - epoch.toordinal())
     if jul <= 60 and offset == CALENDAR_WINDOWS_1900:
         jul -= 1
     if hasattr(dt, 'time'):
         jul += time_to_days(dt)
     return jul
 
-@lru_cache()
+
 def from_excel(value, offset=CALENDAR_WINDOWS_1900):
-    parts = list(jd2gcal(MJD_0, value + offset - MJD_0))
-    fractions = value - int(value)
-    diff = datetime.timedelta(days=fractions)
-    if 1 > value > 0 or 0 > value > -1:
-        return days_to_time(diff)
-    return datetime.datetime(*parts[:3]) + diff
-
-@lru_cache()
+    try:
+        fractions = value - int(value)
+        diff = datetime.timedelta(days=fractions)
+        if 1 > value > 0 or 0 > value > -1:
+            return days_to_time(diff)
+        return _epoch(offset) + datetime.timedelta(days=floor(value)) + diff
+    except OverflowError:
+        raise ValueError("Serial date %r is out of range" % value)
+
+
+class SerialDate(float):
+    """
+    Serial date of a cell with a date format, left for `from_excel_many` or
+    `from_excel_datetime64` to convert with the rest of its column
+    """
+    __slots__ = ()
+
+
+def from_excel_many(values, offset=CALENDAR_WINDOWS_1900):
+    """
+    Convert a sequence of serial dates, such as a column, to datetimes.
+    Empty cells (None or NaN) are returned as None.
+    """
+    epoch = _epoch(offset)
+    timedelta = datetime.timedelta
+    result = []
+    append = result.append
+    for value in values:
+        if value is None or value != value:
+            append(None)
+        elif 1 > value > 0 or 0 > value > -1:
+            append(days_to_time(timedelta(days=value - int(value))))
+        else:
+            try:
+                append(epoch + timedelta(days=floor(value))
+                       + timedelta(days=value - int(value)))
+            except OverflowError:
+                raise ValueError("Serial date %r is out of range" % value)
+    return result
+
+
+def from_excel_datetime64(values, offset=CALENDAR_WINDOWS_1900):
+    """
+    Convert a sequence of serial dates to a numpy datetime64 array with a
+    resolution of microseconds. NaN becomes NaT.
+    Unlike `from_excel` fractions of a day are not returned as times.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('You must install numpy to get arrays of dates')
+    values = numpy.asarray(values, dtype=numpy.float64)
+    missing = numpy.isnan(values)
+    micros = numpy.round(numpy.where(missing, 0, values) * (SECS_PER_DAY * 10**6))
+    result = numpy.datetime64(_epoch(offset), 'us') + micros.astype('timedelta64[us]')
+    result[missing] = numpy.datetime64('NaT')
+    return result
+
+
 def time_to_days(value):
     """Convert a time value to fractions of day"""
     return (
@@ -129,7 +189,7 @@ def time_to_days(value):
         + value.microsecond / 10**6
         ) / SECS_PER_DAY
 
-@lru_cache()
+
 def timedelta_to_days(value):
     """Convert a timedelta value to fractions of a day"""
     if not hasattr(value, 'total_seconds'):
@@ -139,7 +199,7 @@ def timedelta_to_days(value):
         secs =value.total_seconds()
     return secs / SECS_PER_DAY
 
-@lru_cache()
+
 def days_to_time(value):
     mins, seconds = divmod(value.seconds, 60)
     hours, mins = divmod(mins, 60)
@@ -0,0 +1,59 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2014 openpyxl
+
+"""
+Persistent cache for metadata derived from the parts of a workbook.
+
+Entries are json files in a directory of the user's choosing. They are keyed
+by the name, CRC and size of the archive member they describe so they can be
+shared by every copy of the same file and are never used for a modified one.
+"""
+
+import json
+import os
+from hashlib import sha1
+from tempfile import NamedTemporaryFile
+
+
+class MetadataCache(object):
+    """Read and write metadata for archive members"""
+
+    def __init__(self, directory):
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.directory = directory
+
+    def _path(self, info):
+        key = "%s:%08x:%d" % (info.filename, info.CRC, info.file_size)
+        digest = sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, "%s.json" % digest)
+
+    def get(self, info):
+        """
+        Return the metadata stored for a :class:`zipfile.ZipInfo` or an empty
+        dictionary
+        """
+        try:
+            with open(self._path(info)) as src:
+                return json.load(src)
+        except (IOError, OSError, ValueError):
+            # missing, unreadable or half-written entries are misses
+            return {}
+
+    def update(self, info, **values):
+        """Merge `values` into the metadata stored for a :class:`zipfile.ZipInfo`"""
+        metadata = self.get(info)
+        metadata.update(values)
+        path = self._path(info)
+        tmp = NamedTemporaryFile(mode='w', dir=self.directory, suffix='.tmp',
+                                 delete=False)
+        try:
+            json.dump(metadata, tmp)
+            tmp.close()
+            os.rename(tmp.name, path)
+        except (IOError, OSError):
+            # another process may have written the entry first
+            tmp.close()
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+        return metadata
@@ -27,10 +27,11 @@ from __future__ import absolute_import
 # Python stdlib imports
 from zipfile import ZipFile, ZIP_DEFLATED, BadZipfile
 from sys import exc_info
+from multiprocessing import Pool
 import warnings
 
 # compatibility imports
-from openpyxl.compat import unicode, file, StringIO, BytesIO
+from openpyxl.compat import unicode, basestring, file, StringIO, BytesIO
 
 # Allow blanket setting of KEEP_VBA for testing
 try:
@@ -51,7 +52,13 @@ from openpyxl.xml.constants import (
 )
 
 from openpyxl.workbook import Workbook, DocumentProperties
-from openpyxl.reader.strings import read_string_table
+from openpyxl.reader.strings import (
+    read_string_table,
+    StringTable,
+    LazyStringTable,
+    SqliteStringTable,
+    STRING_CACHE_MEMORY,
+)
 from openpyxl.reader.style import read_style_table
 from openpyxl.reader.workbook import (
     read_named_ranges,
@@ -59,11 +66,16 @@ from openpyxl.reader.workbook import (
     read_excel_base_date,
     detect_worksheets
 )
-from openpyxl.reader.worksheet import read_worksheet
+from openpyxl.reader.worksheet import read_worksheet, load_worksheet_data
 from openpyxl.reader.comments import read_comments, get_comments_file
+from openpyxl.reader.cache import MetadataCache
+from openpyxl.reader.sheet_cache import SheetCache, SHEET_CACHE_MEMORY
+from openpyxl.cell.read_only import date_style_flags
 # Use exc_info for Python 2 compatibility with "except Exception[,/ as] e"
 
 
+STRING_TABLES = ('memory', 'lazy', 'sqlite')
+
 CENTRAL_DIRECTORY_SIGNATURE = '\x50\x4b\x05\x06'
 
 def repair_central_directory(zipFile, is_file_instance):
@@ -87,7 +99,7 @@ def repair_central_directory(zipFile, is_file_instance):
     return f
 
 
-def load_workbook(filename, use_iterators=False, keep_vba=KEEP_VBA, guess_types=False, data_only=False):
+def load_workbook(filename, use_iterators=False, keep_vba=KEEP_VBA, guess_types=False, data_only=False, cache_dir=None, shared_strings='memory', strings_memory=STRING_CACHE_MEMORY, workers=None, cache_sheets=False, sheets_memory=SHEET_CACHE_MEMORY):
     """Open the given filename and return the workbook
 
     :param filename: the path to open or a file-like object
@@ -105,6 +117,24 @@ def load_workbook(filename, use_iterators=False, keep_vba=KEEP_VBA, guess_types=
     :param data_only: controls whether cells with formulae have either the formula (default) or the value stored the last time Excel read the sheet
     :type data_only: bool
 
+    :param cache_dir: directory in which to keep metadata such as dimensions and row indexes of worksheets between calls (lazy load only)
+    :type cache_dir: string
+
+    :param shared_strings: 'memory' to read all shared strings up front, 'lazy' to parse them on demand from a temporary copy of the xml or 'sqlite' to store them in a temporary database
+    :type shared_strings: string
+
+    :param strings_memory: bytes of recently used strings to keep in memory when shared strings are 'lazy' or 'sqlite'
+    :type strings_memory: int
+
+    :param workers: number of processes used to parse worksheets. Only used when reading from a filename without lazy load
+    :type workers: int
+
+    :param cache_sheets: inflate each worksheet only once and read later passes from memory or a temporary file (lazy load only)
+    :type cache_sheets: bool
+
+    :param sheets_memory: bytes of uncompressed worksheets to keep in memory when `cache_sheets` is used, larger ones go to temporary files
+    :type sheets_memory: int
+
     :rtype: :class:`openpyxl.workbook.Workbook`
 
     .. note::
@@ -114,6 +144,9 @@ def load_workbook(filename, use_iterators=False, keep_vba=KEEP_VBA, guess_types=
 
     """
 
+    if shared_strings not in STRING_TABLES:
+        raise ValueError("shared_strings must be one of %s" % ", ".join(STRING_TABLES))
+
     is_file_instance = isinstance(filename, file)
 
     if is_file_instance:
@@ -142,7 +175,9 @@ def load_workbook(filename, use_iterators=False, keep_vba=KEEP_VBA, guess_types=
             warnings.warn('Data types are not guessed when using iterator reader')
 
     try:
-        _load_workbook(wb, archive, filename, use_iterators, keep_vba)
+        _load_workbook(wb, archive, filename, use_iterators, keep_vba,
+                       cache_dir, shared_strings, strings_memory, workers,
+                       cache_sheets, sheets_memory)
     except KeyError:
         e = exc_info()[1]
         raise InvalidFileException(unicode(e))
@@ -151,7 +186,10 @@ def load_workbook(filename, use_iterators=False, keep_vba=KEEP_VBA, guess_types=
     return wb
 
 
-def _load_workbook(wb, archive, filename, use_iterators, keep_vba):
+def _load_workbook(wb, archive, filename, use_iterators, keep_vba,
+                   cache_dir=None, shared_strings='memory',
+                   strings_memory=STRING_CACHE_MEMORY, workers=None,
+                   cache_sheets=False, sheets_memory=SHEET_CACHE_MEMORY):
 
     valid_files = archive.namelist()
 
@@ -171,6 +209,10 @@ def _load_workbook(wb, archive, filename, use_iterators, keep_vba):
 
     if use_iterators:
         wb._archive = ZipFile(filename)
+        if cache_dir is not None:
+            wb._metadata_cache = MetadataCache(cache_dir)
+        if cache_sheets:
+            wb._sheet_cache = SheetCache(wb._archive, sheets_memory)
 
     # get workbook-level information
     try:
@@ -180,9 +222,15 @@ def _load_workbook(wb, archive, filename, use_iterators, keep_vba):
         wb.properties = DocumentProperties()
 
     try:
-        string_table = read_string_table(archive.read(ARC_SHARED_STRINGS))
+        if shared_strings == 'lazy':
+            string_table = _read_lazy_string_table(wb, archive, strings_memory)
+        elif shared_strings == 'sqlite':
+            string_table = SqliteStringTable(archive.open(ARC_SHARED_STRINGS),
+                                             strings_memory)
+        else:
+            string_table = read_string_table(archive.read(ARC_SHARED_STRINGS))
     except KeyError:
-        string_table = {}
+        string_table = StringTable()
     try:
         wb.loaded_theme = archive.read(ARC_THEME)  # some writers don't output a theme, live with it (fixes #160)
     except KeyError:
@@ -194,30 +242,76 @@ def _load_workbook(wb, archive, filename, use_iterators, keep_vba):
 
     wb.properties.excel_base_date = read_excel_base_date(xml_source=archive.read(ARC_WORKBOOK))
 
+    if use_iterators:
+        date_styles = date_style_flags(style_table)
+
     # get worksheets
     wb.worksheets = []  # remove preset worksheet
+    sheets = []
     for sheet in detect_worksheets(archive):
-        sheet_name = sheet['title']
         worksheet_path = '%s/%s' % (PACKAGE_XL, sheet['path'])
-        if not worksheet_path in valid_files:
-            continue
-
-        if not use_iterators:
-            new_ws = read_worksheet(archive.read(worksheet_path), wb,
-                                    sheet_name, string_table, style_table,
-                                    color_index=style_properties['color_index'],
-                                    keep_vba=keep_vba)
-        else:
-            new_ws = read_worksheet(None, wb, sheet_name, string_table,
-                                    style_table,
-                                    color_index=style_properties['color_index'],
-                                    worksheet_path=worksheet_path)
-        wb.add_sheet(new_ws)
-
-        if not use_iterators:
-        # load comments into the worksheet cells
-            comments_file = get_comments_file(worksheet_path, archive, valid_files)
-            if comments_file is not None:
-                read_comments(new_ws, archive.read(comments_file))
+        if worksheet_path in valid_files:
+            sheets.append((sheet['title'], worksheet_path))
+
+    pool = None
+    if (workers is not None and workers > 1 and not use_iterators
+        and isinstance(filename, basestring) and len(sheets) > 1):
+        # workers open the archive themselves and return the raw data of
+        # each worksheet in order
+        pool = Pool(min(workers, len(sheets)))
+        data = pool.imap(load_worksheet_data,
+                         [(filename, path) for title, path in sheets])
+
+    try:
+        for sheet_name, worksheet_path in sheets:
+            if not use_iterators:
+                if pool is not None:
+                    xml_source = None
+                    if keep_vba:
+                        xml_source = archive.read(worksheet_path)
+                    new_ws = read_worksheet(xml_source, wb, sheet_name,
+                                            string_table, style_table,
+                                            color_index=style_properties['color_index'],
+                                            keep_vba=keep_vba, data=next(data))
+                else:
+                    new_ws = read_worksheet(archive.read(worksheet_path), wb,
+                                            sheet_name, string_table, style_table,
+                                            color_index=style_properties['color_index'],
+                                            keep_vba=keep_vba)
+            else:
+                new_ws = read_worksheet(None, wb, sheet_name, string_table,
+                                        style_table,
+                                        color_index=style_properties['color_index'],
+                                        worksheet_path=worksheet_path,
+                                        date_styles=date_styles)
+            wb.add_sheet(new_ws)
+
+            if not use_iterators:
+            # load comments into the worksheet cells
+                comments_file = get_comments_file(worksheet_path, archive, valid_files)
+                if comments_file is not None:
+                    read_comments(new_ws, archive.read(comments_file))
+    finally:
+        if pool is not None:
+            # every result has been used unless loading failed
+            pool.terminate()
+            pool.join()
 
     wb._named_ranges = read_named_ranges(archive.read(ARC_WORKBOOK), wb)
+
+
+def _read_lazy_string_table(wb, archive, memory=STRING_CACHE_MEMORY):
+    """Shared strings read on demand, using a cached index where possible"""
+    info = archive.getinfo(ARC_SHARED_STRINGS)
+    cache = getattr(wb, '_metadata_cache', None)
+    index = None
+    if cache is not None:
+        metadata = cache.get(info)
+        if 'strings' in metadata:
+            root, offsets, end = metadata['strings']
+            index = root.encode('utf-8'), offsets, end
+    table = LazyStringTable(archive.open(ARC_SHARED_STRINGS), memory, index)
+    if cache is not None and index is None:
+        cache.update(info, strings=[table.root.decode('utf-8'),
+                                    table.offsets.tolist(), table.end])
+    return table
@@ -0,0 +1,106 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2014 openpyxl
+
+"""
+Uncompressed copies of the worksheets of a read-only workbook.
+
+A worksheet is inflated the first time it is read. Later passes read the
+plain xml, and seeking, used to jump to indexed rows, is no longer done by
+decompressing everything in between.
+"""
+
+from tempfile import TemporaryFile
+from threading import Lock
+
+from openpyxl.compat import BytesIO
+
+SHEET_CACHE_MEMORY = 64 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+class SheetCache(object):
+    """
+    Worksheets of an archive are kept in memory as long as their total
+    uncompressed size stays within `memory` bytes, larger ones are copied to
+    temporary files.
+    """
+
+    def __init__(self, archive, memory=SHEET_CACHE_MEMORY):
+        self.archive = archive
+        self.memory = memory
+        self._files = {}
+        self._lock = Lock()
+
+    def __contains__(self, path):
+        return path in self._files
+
+    def open(self, path):
+        """Return a new file-like object for the uncompressed member"""
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is None:
+                cached = self._files[path] = self._inflate(path)
+        if isinstance(cached, bytes):
+            return BytesIO(cached)
+        return CachedSheet(cached, self._lock)
+
+    def _inflate(self, path):
+        size = self.archive.getinfo(path).file_size
+        if size <= self.memory:
+            self.memory -= size
+            return self.archive.read(path)
+        tmp = TemporaryFile()
+        src = self.archive.open(path)
+        try:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                tmp.write(chunk)
+        finally:
+            src.close()
+        return tmp
+
+    def close(self):
+        for cached in self._files.values():
+            if not isinstance(cached, bytes):
+                cached.close()
+        self._files.clear()
+
+
+class CachedSheet(object):
+    """
+    File-like view of a temporary file with its own position, so that
+    several readers of the same worksheet do not disturb each other
+    """
+
+    def __init__(self, source, lock):
+        self._source = source
+        self._lock = lock
+        self._pos = 0
+
+    def read(self, size=-1):
+        with self._lock:
+            self._source.seek(self._pos)
+            data = self._source.read(size)
+        self._pos += len(data)
+        return data
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            with self._lock:
+                self._source.seek(0, 2)
+                offset += self._source.tell()
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        pass
@@ -24,27 +24,322 @@ from __future__ import absolute_import
 
 """Read the shared strings table."""
 
+# Python stdlib imports
+import os
+import re
+from array import array
+from sys import getsizeof
+from tempfile import TemporaryFile, mkstemp
+from threading import Lock
+
 # package imports
 from openpyxl.xml.functions import fromstring
 from openpyxl.xml.constants import SHEET_MAIN_NS, XML_NS
-from openpyxl.compat import unicode
+from openpyxl.compat import unicode, OrderedDict
+
+STRING_CACHE_MEMORY = 16 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+# strings parsed at once when all of them are read
+STRINGS_PER_PARSE = 10000
+
+SST_RE = re.compile(b'<(?:(\\w+):)?sst(?:\\s[^>]*)?>')
+SI_RE = re.compile(b'<(?:\\w+:)?si[\\s/>]')
+SST_END_RE = re.compile(b'</(?:\\w+:)?sst\\s*>')
+
+try:
+    array('q')
+    OFFSET_TYPE = 'q'
+except ValueError:
+    OFFSET_TYPE = 'l'
+
+
+class StringTable(dict):
+    """Shared strings in memory by their index"""
+
+    _indices = None
+
+    def index_of(self, value):
+        """Index of the first occurrence of `value` or None"""
+        if self._indices is None:
+            self._indices = _reverse(self.items())
+        return self._indices.get(value)
+
+
+def _reverse(items):
+    """Indices of strings from pairs of index and string, the first one wins"""
+    indices = {}
+    for idx, value in items:
+        if value not in indices:
+            indices[value] = idx
+    return indices
 
 
 def read_string_table(xml_source):
     """Read in all shared strings in the table"""
-    table = {}
+    table = StringTable()
     root = fromstring(text=xml_source)
     string_index_nodes = root.findall('{%s}si' % SHEET_MAIN_NS)
     for index, string_index_node in enumerate(string_index_nodes):
+        table[index] = read_si(string_index_node)
 
-        string = get_string(string_index_node)
+    return table
 
-        # fix XML escaping sequence for '_x'
-        string = string.replace('x005F_', '')
 
-        table[index] = string
+def read_si(string_index_node):
+    """Read the string in an <si> element"""
+    string = get_string(string_index_node)
 
-    return table
+    # fix XML escaping sequence for '_x'
+    return string.replace('x005F_', '')
+
+
+def index_string_table(source, target):
+    """
+    Copy the shared strings xml from `source` into `target` in a single pass
+    and record the offset of every <si> element.
+
+    Returns the opening root tag, the offsets and the offset of the closing
+    root tag.
+    """
+    root = None
+    offsets = array(OFFSET_TYPE)
+    end = None
+    position = 0
+    buf = b''
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        target.write(chunk)
+        buf += chunk
+        if chunk:
+            # keep everything from the last opening bracket for the next round
+            cut = buf.rfind(b'<')
+            if cut < 0:
+                cut = len(buf)
+        else:
+            cut = len(buf)
+        scan = buf[:cut]
+        start = 0
+        if root is None:
+            match = SST_RE.search(scan)
+            if match is not None:
+                root = match.group()
+                start = match.end()
+                if root.endswith(b'/>'):
+                    # a self-closing root is an empty table
+                    end = position + start
+        if root is not None and end is None:
+            for match in SI_RE.finditer(scan, start):
+                offsets.append(position + match.start())
+            match = SST_END_RE.search(scan, start)
+            if match is not None:
+                end = position + match.start()
+        position += cut
+        buf = buf[cut:]
+        if not chunk:
+            break
+    if root is None or end is None:
+        raise ValueError("Not a shared strings table")
+    return root, offsets, end
+
+
+class StringCache(object):
+    """Most recently used strings up to a total size in bytes"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            return
+        self._data[key] = value
+        return value
+
+    def set(self, key, value):
+        self._data[key] = value
+        self.size += getsizeof(value)
+        while self.size > self.max_size and self._data:
+            _, old = self._data.popitem(last=False)
+            self.size -= getsizeof(old)
+
+
+class CachedStringTable(object):
+    """
+    Base class for shared string tables that live outside of memory.
+    Subclasses provide `_read(idx)` and `__len__`; recently used strings are
+    cached up to `memory` bytes.
+    Can be used wherever the dictionary from `read_string_table` is.
+    """
+
+    def __init__(self, memory=STRING_CACHE_MEMORY):
+        self._cache = StringCache(memory)
+        self._lock = Lock()
+        self._indices = None
+
+    def __contains__(self, idx):
+        return 0 <= idx < len(self)
+
+    def __getitem__(self, idx):
+        with self._lock:
+            value = self._cache.get(idx)
+            if value is None:
+                if not 0 <= idx < len(self):
+                    raise KeyError(idx)
+                value = self._read(idx)
+                self._cache.set(idx, value)
+        return value
+
+    def get(self, idx, default=None):
+        try:
+            return self[idx]
+        except KeyError:
+            return default
+
+    def index_of(self, value):
+        """
+        Index of the first occurrence of `value` or None. All the strings are
+        read once to build the lookup.
+        """
+        with self._lock:
+            if self._indices is None:
+                self._indices = _reverse(enumerate(self._iter_strings()))
+        return self._indices.get(value)
+
+    def _iter_strings(self):
+        for idx in range(len(self)):
+            yield self._read(idx)
+
+
+class LazyStringTable(CachedStringTable):
+    """
+    Shared strings read on demand.
+
+    The xml is copied to a temporary file in one pass which records where
+    every string starts. Strings are parsed when they are requested.
+    """
+
+    def __init__(self, source, memory=STRING_CACHE_MEMORY, index=None):
+        super(LazyStringTable, self).__init__(memory)
+        self._file = TemporaryFile()
+        if index is None:
+            index = index_string_table(source, self._file)
+        else:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                self._file.write(chunk)
+        root, offsets, end = index
+        if not isinstance(offsets, array):
+            offsets = array(OFFSET_TYPE, offsets)
+        self.root = root
+        self.offsets = offsets
+        self.end = end
+        match = SST_RE.match(root)
+        prefix = match.group(1)
+        if prefix:
+            self._close = b'</' + prefix + b':sst>'
+        else:
+            self._close = b'</sst>'
+
+    @property
+    def index(self):
+        """Root tag and offsets, enough to recreate the table from the xml"""
+        return self.root, self.offsets, self.end
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _stop(self, idx):
+        if idx < len(self.offsets):
+            return self.offsets[idx]
+        return self.end
+
+    def _read(self, idx):
+        return next(self._read_many(idx, idx + 1))
+
+    def _iter_strings(self):
+        for start in range(0, len(self), STRINGS_PER_PARSE):
+            stop = min(start + STRINGS_PER_PARSE, len(self))
+            for value in self._read_many(start, stop):
+                yield value
+
+    def _read_many(self, start, stop):
+        """Parse the strings from `start` up to `stop` in one go"""
+        self._file.seek(self.offsets[start])
+        fragment = self._file.read(self._stop(stop) - self.offsets[start])
+        root = fromstring(self.root + fragment + self._close)
+        for node in root.findall('{%s}si' % SHEET_MAIN_NS):
+            yield read_si(node)
+
+    def close(self):
+        self._file.close()
+
+
+class SqliteStringTable(CachedStringTable):
+    """
+    Shared strings stored in a temporary sqlite database so that only the
+    strings in the cache are kept in memory.
+    """
+
+    batch_size = 10000
+    _indexed = False
+
+    def __init__(self, source, memory=STRING_CACHE_MEMORY):
+        super(SqliteStringTable, self).__init__(memory)
+        try:
+            import sqlite3
+        except ImportError:
+            raise ImportError('You must have sqlite3 to store shared strings on disk')
+        fd, self.path = mkstemp(suffix='.sqlite', prefix='openpyxl.')
+        os.close(fd)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("CREATE TABLE strings (id INTEGER PRIMARY KEY, value TEXT)")
+
+        # parse the xml in blocks of strings from a temporary copy
+        xml = LazyStringTable(source, memory=0)
+        self._length = len(xml)
+        for start in range(0, self._length, self.batch_size):
+            stop = min(start + self.batch_size, self._length)
+            self._db.executemany("INSERT INTO strings VALUES (?, ?)",
+                                 enumerate(xml._read_many(start, stop), start))
+        self._db.commit()
+        xml.close()
+
+    def __len__(self):
+        return self._length
+
+    def _read(self, idx):
+        row = self._db.execute("SELECT value FROM strings WHERE id = ?",
+                               (idx,)).fetchone()
+        return row[0]
+
+    def index_of(self, value):
+        """Index of the first occurrence of `value` or None"""
+        with self._lock:
+            if not self._indexed:
+                self._db.execute("CREATE INDEX string_values ON strings (value)")
+                self._indexed = True
+            row = self._db.execute("SELECT MIN(id) FROM strings WHERE value = ?",
+                                   (value,)).fetchone()
+        return row[0]
+
+    def close(self):
+        self._db.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
 
 def get_string(string_index_node):
@@ -26,10 +26,11 @@ from __future__ import absolute_import
 
 # Python stdlib imports
 from warnings import warn
+from zipfile import ZipFile
 
 # compatibility imports
 from openpyxl.compat import BytesIO
-from openpyxl.xml.functions import iterparse
+from openpyxl.xml.functions import get_engine
 
 # package imports
 from openpyxl import LXML
@@ -37,6 +38,7 @@ from openpyxl.cell import get_column_letter
 from openpyxl.cell import Cell, coordinate_from_string
 from openpyxl.worksheet import Worksheet, ColumnDimension, RowDimension
 from openpyxl.worksheet.iter_worksheet import IterableWorksheet
+from openpyxl.worksheet.tokenizer import read_cell, read_row, iter_rows
 from openpyxl.xml.constants import SHEET_MAIN_NS
 from openpyxl.xml.functions import safe_iterator
 from openpyxl.styles import Color
@@ -44,6 +46,12 @@ from openpyxl.formatting import ConditionalFormatting
 from openpyxl.formatting.rules import FormatRule, CellIsRule, ColorScaleRule, FormatRule
 
 
+# elements outside sheetData handled by the parser
+WORKSHEET_ELEMENTS = frozenset('{%s}%s' % (SHEET_MAIN_NS, tag) for tag in
+    ('mergeCells', 'col', 'printOptions', 'pageMargins', 'pageSetup',
+     'headerFooter', 'conditionalFormatting', 'autoFilter'))
+
+
 def _get_xml_iter(xml_source):
 
     if not hasattr(xml_source, 'read'):
@@ -68,7 +76,8 @@ class WorkSheetParser(object):
     FORMULA_TAG = '{%s}f' % SHEET_MAIN_NS
     MERGE_TAG = '{%s}mergeCell' % SHEET_MAIN_NS
 
-    def __init__(self, ws, xml_source, string_table, style_table, color_index=None):
+    def __init__(self, ws, xml_source, string_table, style_table, color_index=None,
+                 engine=None):
         self.ws = ws
         self.source = xml_source
         self.string_table = string_table
@@ -76,15 +85,12 @@ class WorkSheetParser(object):
         self.color_index = color_index
         self.guess_types = ws.parent._guess_types
         self.data_only = ws.parent.data_only
+        self.engine = engine
 
     def parse(self):
-        stream = _get_xml_iter(self.source)
-        it = iterparse(stream)
-
         dispatcher = {
             '{%s}mergeCells' % SHEET_MAIN_NS: self.parse_merge,
             '{%s}col' % SHEET_MAIN_NS: self.parse_column_dimensions,
-            '{%s}row' % SHEET_MAIN_NS: self.parse_row_dimensions,
             '{%s}printOptions' % SHEET_MAIN_NS: self.parse_print_options,
             '{%s}pageMargins' % SHEET_MAIN_NS: self.parse_margins,
             '{%s}pageSetup' % SHEET_MAIN_NS: self.parse_page_setup,
@@ -92,52 +98,50 @@ class WorkSheetParser(object):
             '{%s}conditionalFormatting' % SHEET_MAIN_NS: self.parser_conditional_formatting,
             '{%s}autoFilter' % SHEET_MAIN_NS: self.parse_auto_filter
                       }
-        tags = dispatcher.keys()
         stream = _get_xml_iter(self.source)
-        it = iterparse(stream, tag=tags)
 
-        for event, element in it:
-            tag_name = element.tag
-            if tag_name in dispatcher:
-                dispatcher[tag_name](element)
-                element.clear()
+        for item in iter_rows(stream, self.engine, dispatcher):
+            if isinstance(item, tuple):
+                self.apply_row(item)
+            else:
+                dispatcher[item.tag](item)
 
         # Handle parsed conditional formatting rules together.
         if len(self.ws.conditional_formatting.parse_rules):
             self.ws.conditional_formatting.update(self.ws.conditional_formatting.parse_rules)
 
     def parse_cell(self, element):
-        value = element.findtext(self.VALUE_TAG)
-        formula = element.find(self.FORMULA_TAG)
+        self.apply_cell(*read_cell(element))
 
-        coordinate = element.get('r')
-        style_id = element.get('s')
+    def apply_cell(self, coordinate, style_id, value, data_type, formula):
         if style_id is not None:
             self.ws._styles[coordinate] = self.style_table.get(int(style_id))
 
         if value is not None and value is not '':
             cell = self.ws[coordinate]
-            data_type = element.get('t', 'n')
             if data_type == Cell.TYPE_STRING:
                 value = self.string_table.get(int(value))
             elif data_type == Cell.TYPE_BOOL:
                 value = bool(int(value))
+            elif data_type == Cell.TYPE_INLINE:
+                # stored in the shared strings when saved
+                data_type = Cell.TYPE_STRING
             elif data_type == 'n':
                 cell._cast_numeric(value)
                 if self.data_only or formula is None:
                     return
             if formula is not None and not self.data_only:
-                if formula.text:
-                    value = "=" + formula.text
+                text, formula_type, shared, ref = formula
+                if text:
+                    value = "=" + text
                 else:
                     value = "="
-                formula_type = formula.get('t')
                 if formula_type:
                     self.ws.formula_attributes[coordinate] = {'t': formula_type}
-                    if formula.get('si'):  # Shared group index for shared formulas
-                        self.ws.formula_attributes[coordinate]['si'] = formula.get('si')
-                    if formula.get('ref'):  # Range for shared formulas
-                        self.ws.formula_attributes[coordinate]['ref'] = formula.get('ref')
+                    if shared:  # Shared group index for shared formulas
+                        self.ws.formula_attributes[coordinate]['si'] = shared
+                    if ref:  # Range for shared formulas
+                        self.ws.formula_attributes[coordinate]['ref'] = ref
             if not self.guess_types and formula is None:
                 cell.set_explicit_value(value=value, data_type=data_type)
             else:
@@ -173,15 +177,16 @@ class WorkSheetParser(object):
 
 
     def parse_row_dimensions(self, row):
-        rowId = int(row.get('r'))
-        ht = row.get('ht', -1)
+        self.apply_row(read_row(row))
+
+    def apply_row(self, row):
+        rowId, ht, style_index, custom_format, cells = row
         if rowId not in self.ws.row_dimensions:
             self.ws.row_dimensions[rowId] = RowDimension(rowId, height=ht)
-        style_index = row.get('s')
-        if row.get('customFormat') and style_index:
+        if custom_format and style_index:
             self.ws._styles[rowId] = self.style_table.get(int(style_index))
-        for cell in safe_iterator(row, self.CELL_TAG):
-            self.parse_cell(cell)
+        for cell in cells:
+            self.apply_cell(*cell)
 
 
     def parse_print_options(self, element):
@@ -301,22 +306,88 @@ class WorkSheetParser(object):
         for sc in safe_iterator(element, '{%s}sortCondition' % SHEET_MAIN_NS):
             self.ws.auto_filter.add_sort_condition(sc.get("ref"), sc.get("descending"))
 
-def fast_parse(ws, xml_source, string_table, style_table, color_index=None):
+def read_worksheet_data(xml_source, engine=None):
+    """
+    Split a worksheet into the raw data of its rows and two xml documents
+    containing everything else the parser understands, one for the elements
+    before the rows and one for those after them.
+
+    All are plain python objects which can be sent between processes.
+    """
+    engine = get_engine(engine)
+    rows = []
+    head = []
+    tail = []
+    for item in iter_rows(_get_xml_iter(xml_source), engine.name,
+                          WORKSHEET_ELEMENTS):
+        if isinstance(item, tuple):
+            rows.append(item)
+        else:
+            item.tail = None
+            if rows:
+                tail.append(engine.tostring(item))
+            else:
+                head.append(engine.tostring(item))
+    return (b"<worksheet>" + b"".join(head) + b"</worksheet>", rows,
+            b"<worksheet>" + b"".join(tail) + b"</worksheet>")
+
 
-    parser = WorkSheetParser(ws, xml_source, string_table, style_table, color_index)
+def load_worksheet_data(args):
+    """
+    Open a workbook and read the data of one of its worksheets.
+    Used by worker processes, the argument is a (filename, path) tuple.
+    """
+    filename, worksheet_path = args
+    archive = ZipFile(filename)
+    try:
+        return read_worksheet_data(archive.open(worksheet_path))
+    finally:
+        archive.close()
+
+
+def fast_parse(ws, xml_source, string_table, style_table, color_index=None,
+               engine=None):
+
+    parser = WorkSheetParser(ws, xml_source, string_table, style_table,
+                             color_index, engine)
+    parser.parse()
+    del parser
+
+
+def fast_parse_data(ws, data, string_table, style_table, color_index=None):
+    """
+    Populate a worksheet from the result of `read_worksheet_data`, in the
+    same order as the elements appear in the worksheet
+    """
+    head, rows, tail = data
+    parser = WorkSheetParser(ws, head, string_table, style_table, color_index)
+    parser.parse()
+    for row in rows:
+        parser.apply_row(row)
+    parser.source = tail
     parser.parse()
     del parser
 
 
 def read_worksheet(xml_source, parent, preset_title, string_table,
-                   style_table, color_index=None, worksheet_path=None, keep_vba=False):
-    """Read an xml worksheet"""
+                   style_table, color_index=None, worksheet_path=None, keep_vba=False,
+                   date_styles=None, data=None):
+    """
+    Read an xml worksheet
+
+    `data` is the result of `read_worksheet_data` for worksheets parsed in
+    another process.
+    """
     if worksheet_path:
         ws = IterableWorksheet(parent, preset_title,
-                worksheet_path, xml_source, string_table, style_table)
+                worksheet_path, xml_source, string_table, style_table,
+                date_styles)
     else:
         ws = Worksheet(parent, preset_title)
-        fast_parse(ws, xml_source, string_table, style_table, color_index)
+        if data is not None:
+            fast_parse_data(ws, data, string_table, style_table, color_index)
+        else:
+            fast_parse(ws, xml_source, string_table, style_table, color_index)
     if keep_vba:
         ws.xml_source = xml_source
     return ws
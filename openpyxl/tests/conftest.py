@@ -167,3 +167,5 @@ def pytest_runtest_setup(item):
             pytest.skip("Ordering is not a given in Python 3")
         elif item.get_marker("lxml_required"):
             pytest.skip("LXML is required for some features such as schema validation")
+        elif item.get_marker("numpy_required"):
+            pytest.importorskip("numpy")
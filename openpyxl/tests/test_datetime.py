@@ -140,3 +140,63 @@ def test_days_to_time():
     td = timedelta(0, 51320, 1600)
     FUT = days_to_time
     assert days_to_time(td) == time(14, 15, 20, 1600)
+
+
+@pytest.mark.parametrize("offset", [CALENDAR_WINDOWS_1900, CALENDAR_MAC_1904])
+@pytest.mark.parametrize("value",
+                         [-25063.75, -1.5, -0.25, 0, 0.5, 1, 59.99, 60, 61.25,
+                          40196.5939815, 2900000.999988426])
+def test_from_excel_julian(value, offset):
+    # arithmetic conversion must agree with the calendar library
+    from jdcal import jd2gcal
+    from openpyxl.date_time import from_excel, days_to_time
+    diff = timedelta(days=value - int(value))
+    if 1 > value > 0 or 0 > value > -1:
+        expected = days_to_time(diff)
+    else:
+        expected = datetime(*jd2gcal(offset, value)[:3]) + diff
+    assert from_excel(value, offset) == expected
+
+
+@pytest.mark.parametrize("offset", [CALENDAR_WINDOWS_1900, CALENDAR_MAC_1904])
+@pytest.mark.parametrize("value",
+                         [date(1, 1, 1), date(1899, 12, 31), date(1900, 2, 28),
+                          date(1900, 3, 1), datetime(2010, 1, 18, 14, 15, 20),
+                          datetime(9999, 12, 31, 23, 59, 59)])
+def test_to_excel_julian(value, offset):
+    from jdcal import gcal2jd
+    from openpyxl.date_time import to_excel, time_to_days
+    expected = sum(gcal2jd(value.year, value.month, value.day)) - offset
+    if expected <= 60 and offset == CALENDAR_WINDOWS_1900:
+        expected -= 1
+    if hasattr(value, 'time'):
+        expected += time_to_days(value)
+    assert to_excel(value, offset) == expected
+
+
+def test_from_excel_many():
+    from openpyxl.date_time import from_excel_many
+    values = [40196.5, None, float('nan'), 0.125, 0]
+    assert from_excel_many(values) == [datetime(2010, 1, 18, 12), None, None,
+                                       time(3, 0), datetime(1899, 12, 30)]
+
+
+@pytest.mark.parametrize("value", [1e12, float('inf')])
+def test_from_excel_out_of_range(value):
+    from openpyxl.date_time import from_excel, from_excel_many
+    with pytest.raises(ValueError):
+        from_excel(value)
+    with pytest.raises(ValueError):
+        from_excel_many([value])
+
+
+@pytest.mark.numpy_required
+def test_from_excel_datetime64():
+    import numpy
+    from openpyxl.date_time import from_excel_datetime64
+    result = from_excel_datetime64([40196.5939815, float('nan'), 0],
+                                   CALENDAR_MAC_1904)
+    assert result.dtype == numpy.dtype('datetime64[us]')
+    assert result[0] == numpy.datetime64('2014-01-19T14:15:20.001600')
+    assert numpy.isnat(result[1])
+    assert result[2] == numpy.datetime64('1904-01-01')
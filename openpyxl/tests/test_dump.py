@@ -134,3 +134,220 @@ def test_append_after_save():
     os.remove(test_filename)
     with pytest.raises(WorkbookAlreadySaved):
         ws.append(['hello'])
+
+def test_dimension():
+    test_filename = _get_test_filename()
+
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    for idx in range(3):
+        ws.append([idx, None, 'row %d' % idx])
+    temp_files = ws._temp_files
+    assert len(temp_files) == 1
+
+    wb.save(test_filename)
+    assert not os.path.exists(temp_files[0])
+    wb2 = load_workbook(test_filename, use_iterators=True)
+    assert wb2.worksheets[0].dimensions == 'A1:C3'
+    os.remove(test_filename)
+
+def test_escaped_formula():
+    from zipfile import ZipFile
+    test_filename = _get_test_filename()
+
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    ws.append([1, 2, u'=IF(A1<B1,"\u20ac","&")', True])
+
+    wb.save(test_filename)
+    archive = ZipFile(test_filename)
+    xml = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    archive.close()
+    assert u'<c r="C1"><f>IF(A1&lt;B1,"\u20ac","&amp;")</f><v></v></c>' in xml
+    wb2 = load_workbook(test_filename)
+    assert wb2.worksheets[0]['D1'].value is True
+    os.remove(test_filename)
+
+def test_append_rows():
+    test_filename = _get_test_filename()
+
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    ws.append(['first'])
+    ws.append_rows([(idx, 'row %d' % idx, None, idx * 0.5) for idx in range(2500)])
+    ws.append_rows(iter([]))
+
+    wb.save(test_filename)
+    wb2 = load_workbook(test_filename, use_iterators=True)
+    ws2 = wb2.worksheets[0]
+    assert ws2.dimensions == 'A1:D2501'
+    rows = list(ws2.iter_values())
+    assert rows[0] == ('first', None, None, None)
+    assert rows[2500] == (2499, 'row 2499', None, 1249.5)
+    os.remove(test_filename)
+
+
+@pytest.mark.numpy_required
+def test_append_numpy():
+    import numpy
+    test_filename = _get_test_filename()
+
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    ws.append_rows(numpy.array([[1.5, 2], [numpy.nan, 4]]))
+    ws.append_rows(numpy.arange(6).reshape(2, 3))
+    ws.append_rows(numpy.array([['2014-01-02']], dtype='datetime64[D]'))
+
+    wb.save(test_filename)
+    wb2 = load_workbook(test_filename, use_iterators=True)
+    rows = list(wb2.worksheets[0].iter_values())
+    assert rows == [(1.5, 2, None), (None, 4, None), (0, 1, 2), (3, 4, 5),
+                    (datetime(2014, 1, 2), None, None)]
+    os.remove(test_filename)
+
+
+def test_schema():
+    from zipfile import ZipFile
+    test_filename = _get_test_filename()
+
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    ws.set_schema(['number', 'date', 'string', 'inline', 'bool', 'formula',
+                   '0.000%', ('date', 'yyyy-mm-dd hh:mm')])
+    day = datetime(2014, 1, 2, 12, 30)
+    ws.append([1.5, day, 'shared', ' <inline> ', False, '=A1*2', 0.25, day])
+    ws.append([None, day, 'shared', None, True, 'A1', float('nan'), None, 'extra'])
+    ws.set_schema(None)
+    ws.append([3, 'sniffed'])
+
+    wb.save(test_filename)
+    archive = ZipFile(test_filename)
+    xml = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    styles = archive.read('xl/styles.xml').decode('utf-8')
+    archive.close()
+    assert '<c r="D1" t="inlineStr"><is><t xml:space="preserve">&lt;inline&gt;</t></is></c>' in xml
+    assert '<c r="F1"><f>A1*2</f><v></v></c>' in xml
+    assert '<c r="F2"><f>A1</f><v></v></c>' in xml
+    assert '<c r="G1" t="n" s="2"><v>0.25</v></c>' in xml
+    assert '<c r="H1" t="n" s="3">' in xml
+    assert 'formatCode="0.000%"' in styles
+    assert 'formatCode="yyyy-mm-dd hh:mm"' in styles
+
+    wb2 = load_workbook(test_filename, use_iterators=True)
+    rows = list(wb2.worksheets[0].iter_values())
+    assert rows[0][:5] == (1.5, day, 'shared', '<inline>', False)
+    assert rows[0][6:8] == (0.25, day)
+    assert rows[1][:5] == (None, day, 'shared', None, True)
+    assert rows[1][6:] == (None, None, 'extra')
+    assert rows[2][:2] == (3, 'sniffed')
+    os.remove(test_filename)
+
+
+def test_schema_format_type():
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    with pytest.raises(ValueError):
+        ws.set_schema([('string', '0.00')])
+
+
+def test_string_modes():
+    from zipfile import ZipFile
+    test_filename = _get_test_filename()
+
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    ws.set_string_mode('inline')
+    ws.append(['inline & <escaped>'])
+    ws.set_string_mode('hybrid', min_count=2)
+    for idx in range(3):
+        ws.append(['unique %d' % idx, 'repeated'])
+    ws.set_schema(['string'])
+    ws.set_string_mode('shared')
+    ws.append(['shared'])
+
+    assert sorted(wb.strings_table_builder.get_table()) == ['repeated', 'shared']
+    wb.save(test_filename)
+    archive = ZipFile(test_filename)
+    xml = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    archive.close()
+    assert '<t xml:space="preserve">inline &amp; &lt;escaped&gt;</t>' in xml
+    assert '<c r="B2" t="inlineStr">' in xml
+    assert '<c r="B3" t="s"><v>0</v></c>' in xml
+
+    wb2 = load_workbook(test_filename, use_iterators=True)
+    rows = list(wb2.worksheets[0].iter_values())
+    assert rows == [('inline & <escaped>', None), ('unique 0', 'repeated'),
+                    ('unique 1', 'repeated'), ('unique 2', 'repeated'),
+                    ('shared', None)]
+    os.remove(test_filename)
+
+
+@pytest.mark.parametrize("mode", ['shared', 'inline', 'hybrid'])
+def test_string_modes_strip(mode):
+    test_filename = _get_test_filename()
+
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    ws.set_string_mode(mode, min_count=2)
+    for _ in range(3):
+        ws.append(['  padded  '])
+    ws.set_schema(['string'])
+    ws.append(['  padded  '])
+
+    wb.save(test_filename)
+    wb2 = load_workbook(test_filename, use_iterators=True)
+    rows = list(wb2.worksheets[0].iter_values())
+    assert rows == [('padded',)] * 4
+    os.remove(test_filename)
+
+
+def test_unknown_string_mode():
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    with pytest.raises(ValueError):
+        ws.set_string_mode('compressed')
+
+
+def test_sqlite_strings():
+    test_filename = _get_test_filename()
+
+    wb = Workbook(optimized_write=True, shared_strings='sqlite', strings_memory=1000)
+    ws = wb.create_sheet()
+    for idx in range(100):
+        ws.append(['row %d' % idx, 'repeated'])
+    path = wb.strings_table_builder.path
+    assert os.path.exists(path)
+
+    wb.save(test_filename)
+    assert not os.path.exists(path)
+    wb2 = load_workbook(test_filename, use_iterators=True)
+    rows = list(wb2.worksheets[0].iter_values())
+    assert rows == [('row %d' % idx, 'repeated') for idx in range(100)]
+    os.remove(test_filename)
+
+    with pytest.raises(ValueError):
+        Workbook(optimized_write=True, shared_strings='lazy')
+
+
+@pytest.mark.numpy_required
+def test_append_numpy_schema():
+    import numpy
+    from zipfile import ZipFile
+    test_filename = _get_test_filename()
+
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    ws.set_schema(['date', '0.000%'])
+    ws.append_rows(numpy.array([[41641.5, 0.25], [numpy.nan, 0.5]]))
+
+    wb.save(test_filename)
+    archive = ZipFile(test_filename)
+    xml = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    archive.close()
+    assert '<c r="A1" t="n" s="1"><v>41641.5</v></c>' in xml
+    assert '<c r="B1" t="n" s="2"><v>0.25</v></c>' in xml
+    assert 'r="A2"' not in xml
+    wb2 = load_workbook(test_filename, use_iterators=True)
+    rows = list(wb2.worksheets[0].iter_values())
+    assert rows == [(datetime(2014, 1, 2, 12), 0.25), (None, 0.5)]
+    os.remove(test_filename)
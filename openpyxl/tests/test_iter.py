@@ -47,7 +47,7 @@ def test_open_many_sheets(datadir):
                          )
 def test_read_dimension(datadir, filename, expected):
     datadir.join("reader").chdir()
-    with open(filename) as handle:
+    with open(filename, "rb") as handle:
         dimension = read_dimension(handle)
     assert dimension == expected
 
@@ -218,3 +218,471 @@ class TestBoolean(TestWorksheet):
         assert row[0][0].coordinate == cell
         assert row[0][0].data_type == 'b'
         assert row[0][0].value == expected
+
+
+@pytest.fixture
+def long_sheet(tmpdir):
+    """Read-only worksheet with 2500 rows of numbers"""
+    from openpyxl.workbook import Workbook
+    wb = Workbook(optimized_write=True)
+    ws = wb.create_sheet()
+    for idx in xrange(1, 2501):
+        ws.append([idx, idx * 2, "row %d" % idx])
+    filename = str(tmpdir.join("long.xlsx"))
+    wb.save(filename)
+    wb = load_workbook(filename, use_iterators=True)
+    return wb.worksheets[0]
+
+
+class TestRowIndex:
+
+    def test_build(self):
+        from openpyxl.compat import BytesIO
+        from openpyxl.worksheet.row_index import build_row_index
+        xml = b"""<x:worksheet xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+        <x:dimension ref="A1:A5"/><x:sheetData>
+        <x:row r="1"><x:c r="A1"><x:v>1</x:v></x:c></x:row>
+        <x:row spans="1:1" r="2"><x:c r="A2"><x:v>2</x:v></x:c></x:row>
+        <x:row r="4"><x:c r="A4"><x:v>4</x:v></x:c></x:row>
+        <x:row r="5"><x:c r="A5"><x:v>5</x:v></x:c></x:row>
+        </x:sheetData><x:rowBreaks count="0"/></x:worksheet>"""
+        index = build_row_index(BytesIO(xml), interval=2)
+        assert index.rows == [1, 4]
+        assert xml[index.data_offset - 13:index.data_offset] == b"<x:sheetData>"
+        for offset in index.offsets:
+            assert xml[offset:offset + 6] == b"<x:row"
+        assert index.find(3) == (1, index.offsets[0])
+        assert index.find(5) == (4, index.offsets[1])
+        assert index.find(0) is None
+
+    def test_empty_sheet(self):
+        from openpyxl.compat import BytesIO
+        from openpyxl.worksheet.row_index import build_row_index
+        xml = b"""<worksheet><sheetData /></worksheet>"""
+        index = build_row_index(BytesIO(xml))
+        assert len(index) == 0
+        assert build_row_index(BytesIO(b"<worksheet/>")) is None
+
+    def test_index_rows(self, long_sheet):
+        index = long_sheet.index_rows(interval=100)
+        assert len(index) == 25
+        assert index.rows[:3] == [1, 101, 201]
+
+    def test_ranged_read(self, long_sheet):
+        expected = [[c.value for c in row] for row in long_sheet.iter_rows('A2050:C2052')]
+        long_sheet.index_rows(interval=100)
+        rows = [[c.value for c in row] for row in long_sheet.iter_rows('A2050:C2052')]
+        assert rows == expected
+        assert rows[0] == [2050, 4100, 'row 2050']
+        assert len(list(long_sheet.iter_rows())) == 2500
+
+
+class TestCellCache:
+
+    def test_lookup(self, long_sheet):
+        assert long_sheet['B2500'].value == 5000
+        assert long_sheet.cell('c7').value == 'row 7'
+        assert long_sheet.cell(row=9, column=0).value == 10
+        assert long_sheet['D5'] is None
+        assert long_sheet['A3000'] is None
+
+    def test_head(self, long_sheet):
+        assert long_sheet['C1000'].value == 'row 1000'
+        assert long_sheet['A1'].value == 1
+        assert long_sheet.row_index is None
+        assert long_sheet.cell_cache_info() == (0, 0, 8, 0)
+        assert long_sheet['A1001'].value == 1001
+        assert long_sheet.row_index is not None
+
+    def test_gap(self, tmpdir):
+        from openpyxl.workbook import Workbook
+        from openpyxl.cell.read_only import EMPTY_CELL
+        filename = str(tmpdir.join('gaps.xlsx'))
+        wb = Workbook()
+        ws = wb.active
+        ws['A5'] = 1
+        ws['E5'] = 2
+        ws['A7'] = 3
+        wb.save(filename)
+        ws = load_workbook(filename, use_iterators=True).worksheets[0]
+        assert ws['C5'] is EMPTY_CELL
+        assert ws['C5'].value is None
+        assert ws['E7'] is EMPTY_CELL
+        # missing rows and cells outside the dimensions
+        assert ws['A6'] is None
+        assert ws['F5'] is None
+
+    def test_stats(self, long_sheet):
+        long_sheet.index_rows(interval=100)
+        for coord in ['A1', 'A2', 'A150', 'B3']:
+            long_sheet[coord]
+        assert long_sheet.cell_cache_info() == (2, 2, 8, 2)
+
+    def test_evict(self, long_sheet):
+        long_sheet.index_rows(interval=100)
+        long_sheet.cell_cache_blocks = 2
+        for coord in ['A1', 'A150', 'A250', 'A1']:
+            long_sheet[coord]
+        assert long_sheet.cell_cache_info() == (0, 4, 2, 2)
+
+
+class TestParallel:
+
+    def test_segments(self, long_sheet):
+        long_sheet.index_rows(interval=100)
+        segments = long_sheet._get_segments(1, None, 2)
+        # 25 checkpoints in groups of 3 for 4 segments per worker
+        assert len(segments) == 9
+        assert segments[0][1:] == (1, 300)
+        assert segments[-1][1:] == (2401, None)
+        assert long_sheet._get_segments(150, 180, 2) is None
+
+    def test_values(self, long_sheet):
+        long_sheet.index_rows(interval=100)
+        assert list(long_sheet.iter_values(workers=2)) == list(long_sheet.iter_values())
+        rows = list(long_sheet.iter_values('B250:C1750', workers=2))
+        assert rows == list(long_sheet.iter_values('B250:C1750'))
+        assert rows[0] == (500, 'row 250')
+
+    def test_batches(self, long_sheet):
+        batches = list(long_sheet.iter_batches(batch_size=1000, workers=2))
+        assert [len(b['C']) for b in batches] == [1000, 1000, 500]
+        assert batches[2]['C'][-1] == 'row 2500'
+
+
+class TestMetadataCache:
+
+    def test_round_trip(self, tmpdir):
+        from zipfile import ZipInfo
+        from openpyxl.reader.cache import MetadataCache
+        cache = MetadataCache(str(tmpdir.join("cache")))
+        info = ZipInfo("xl/worksheets/sheet1.xml")
+        info.CRC = 1234
+        info.file_size = 100
+        assert cache.get(info) == {}
+        cache.update(info, dimensions=['A', 1, 'C', 5])
+        cache.update(info, row_index=None)
+        assert cache.get(info) == {'dimensions': ['A', 1, 'C', 5], 'row_index': None}
+        info.CRC = 4321
+        assert cache.get(info) == {}
+
+    def test_reopen(self, long_sheet, tmpdir, monkeypatch):
+        from openpyxl.worksheet import iter_worksheet
+        filename = long_sheet.parent._archive.filename
+        cache_dir = str(tmpdir.join("cache"))
+        ws = load_workbook(filename, use_iterators=True, cache_dir=cache_dir).worksheets[0]
+        ws.index_rows(interval=100)
+
+        def fail(source):
+            raise AssertionError("Dimensions should come from the cache")
+        monkeypatch.setattr(iter_worksheet, "read_dimension", fail)
+        ws = load_workbook(filename, use_iterators=True, cache_dir=cache_dir).worksheets[0]
+        assert ws.dimensions == "A1:C2500"
+        assert ws.row_index.rows[:2] == [1, 101]
+        row = list(ws.iter_rows("A2499:C2499"))[0]
+        assert [c.value for c in row] == [2499, 4998, "row 2499"]
+
+
+class TestValues(TestWorksheet):
+
+    @pytest.mark.parametrize("sheet_name",
+                             ["Sheet1 - Text", "Sheet2 - Numbers",
+                              "Sheet3 - Formulas", "Sheet4 - Dates"])
+    def test_same_as_cells(self, sheet_name):
+        wb = self._open_wb()
+        ws = wb[sheet_name]
+        expected = [tuple(c.value for c in row) for row in ws.iter_rows()]
+        assert list(ws.iter_rows(values_only=True)) == expected
+
+    def test_range(self):
+        wb = self._open_wb()
+        ws = wb["Sheet2 - Numbers"]
+        rows = list(ws.iter_values("D1:E3"))
+        assert rows == [(1, None), (2, None), (3, None)]
+
+    def test_boolean_and_dates(self):
+        wb = self._open_wb()
+        assert list(wb["Sheet2 - Numbers"].iter_values("G9:G10")) == [(True,), (False,)]
+        assert list(wb["Sheet4 - Dates"].iter_values("A1")) == [(datetime.datetime(1973, 5, 20),)]
+
+    def test_formula(self):
+        wb = self._open_wb(data_only=True)
+        assert list(wb["Sheet3 - Formulas"].iter_values("D2")) == [(5,)]
+
+
+class TestBatches:
+
+    def test_batches(self, long_sheet):
+        from array import array
+        batches = list(long_sheet.iter_batches(batch_size=1000))
+        assert [len(b['A']) for b in batches] == [1000, 1000, 500]
+        first = batches[0]
+        assert list(first.keys()) == ['A', 'B', 'C']
+        assert isinstance(first['A'], array)
+        assert first['B'][:3] == array('d', [2, 4, 6])
+        assert first['C'][:2] == ['row 1', 'row 2']
+
+    def test_columns(self, long_sheet):
+        batch = next(long_sheet.iter_batches(batch_size=10, columns=['C', 'A']))
+        assert list(batch.keys()) == ['C', 'A']
+        assert batch['A'].tolist() == list(range(1, 11))
+
+    def test_empty_cells(self):
+        from openpyxl.worksheet.columns import make_column
+        column = make_column([1, None, 3.5])
+        assert column[0] == 1 and column[2] == 3.5
+        assert column[1] != column[1] # NaN
+        assert make_column([True, None]) == [True, None]
+
+    def test_string_codes(self, long_sheet):
+        from array import array
+        from openpyxl.worksheet.columns import StringColumn
+        batch = next(long_sheet.iter_batches(batch_size=10, string_codes=True))
+        assert isinstance(batch['A'], array)
+        column = batch['C']
+        assert isinstance(column, StringColumn)
+        assert column.codes[1] == long_sheet.shared_string_index('row 2')
+        assert list(column)[:2] == ['row 1', 'row 2']
+
+    def test_code_columns(self):
+        from openpyxl.worksheet.columns import make_column
+        table = {0: 'EUR', 1: 'USD'}
+        column = make_column([1, None, 0, 1], string_table=table)
+        assert column.codes.tolist() == [1, -1, 0, 1]
+        assert list(column) == ['USD', None, 'EUR', 'USD']
+        assert make_column([1, 'inline', None], string_table=table) == ['USD', 'inline', None]
+
+    def test_dates(self):
+        wb = load_workbook(os.path.join(DATADIR, 'genuine', 'empty.xlsx'),
+                           use_iterators=True)
+        batch = next(wb['Sheet4 - Dates'].iter_batches())
+        assert batch['A'] == [datetime.datetime(1973, 5, 20)]
+        assert batch['C'] == [datetime.datetime(1973, 5, 20, 9, 15, 2)]
+
+    def test_mixed_dates(self):
+        from openpyxl.date_time import SerialDate, CALENDAR_WINDOWS_1900
+        from openpyxl.worksheet.columns import make_column
+        column = make_column([SerialDate(26804), None, 'text'],
+                             base_date=CALENDAR_WINDOWS_1900)
+        assert column == [datetime.datetime(1973, 5, 20), None, 'text']
+
+    @pytest.mark.numpy_required
+    def test_numpy_dates(self):
+        import numpy
+        wb = load_workbook(os.path.join(DATADIR, 'genuine', 'empty.xlsx'),
+                           use_iterators=True)
+        batch = next(wb['Sheet4 - Dates'].iter_batches(use_numpy=True))
+        assert batch['A'].dtype == numpy.dtype('datetime64[us]')
+        assert batch['C'][0] == numpy.datetime64('1973-05-20T09:15:02')
+
+    @pytest.mark.numpy_required
+    def test_numpy(self, long_sheet):
+        import numpy
+        batch = next(long_sheet.iter_batches(batch_size=5, use_numpy=True))
+        assert batch['A'].dtype == numpy.float64
+        assert batch['A'].sum() == 15
+        assert batch['C'].dtype == object
+        codes = next(long_sheet.iter_batches(batch_size=5, use_numpy=True,
+                                             string_codes=True))['C'].codes
+        assert codes.dtype == numpy.intc
+
+
+def every_50th(raw):
+    return int(raw['A']) % 50 == 0
+
+
+class TestFilters:
+
+    def test_columns(self, long_sheet):
+        rows = long_sheet.iter_values(columns=['C', 'A'])
+        assert next(rows) == ('row 1', 1)
+        cells = next(long_sheet.iter_rows(columns=['B']))
+        assert [c.coordinate for c in cells] == ['B1']
+
+    def test_where(self, long_sheet):
+        rows = list(long_sheet.iter_values(where=every_50th))
+        assert len(rows) == 50
+        assert rows[0] == (50, 100, 'row 50')
+        cells = list(long_sheet.iter_rows('A1:C200', columns=['A'], where=every_50th))
+        assert [[c.value for c in row] for row in cells] == [[50], [100], [150], [200]]
+
+    def test_shared_strings(self, long_sheet):
+        idx = long_sheet.shared_string_index('row 7')
+        rows = long_sheet.iter_values(columns=['A'], where=lambda raw: raw['C'] == idx)
+        assert list(rows) == [(7,)]
+        assert long_sheet.shared_string_index('missing') is None
+
+    def test_raw_values(self):
+        from openpyxl.worksheet.iter_worksheet import raw_values
+        cells = [('A1', None, '2.5', 'n', None), ('B1', '1', '3', 's', None),
+                 (None, None, None, 'n', None)]
+        assert raw_values(cells) == {'A': '2.5', 'B': 3, 'C': None}
+
+    def test_workers(self, long_sheet):
+        long_sheet.index_rows(interval=100)
+        rows = list(long_sheet.iter_values(columns=['C'], where=every_50th, workers=2))
+        assert rows == list(long_sheet.iter_values(columns=['C'], where=every_50th))
+        assert rows[-1] == ('row 2500',)
+
+
+class TestAggregate:
+
+    def test_columns(self, long_sheet):
+        stats = long_sheet.aggregate()
+        assert list(stats) == ['A', 'B', 'C']
+        assert stats['A'] == {'count': 2500, 'nulls': 0, 'sum': 3126250,
+                              'min': 1, 'max': 2500,
+                              'distinct': stats['A']['distinct']}
+        assert abs(stats['A']['distinct'] - 2500) < 250
+        assert stats['C']['sum'] is None
+        assert stats['C']['min'] is None
+
+    def test_selected(self, long_sheet):
+        stats = long_sheet.aggregate(['D', 'B'], ['count', 'nulls', 'max'])
+        assert list(stats.items()) == [('D', {'count': 0, 'nulls': 2500, 'max': None}),
+                                       ('B', {'count': 2500, 'nulls': 0, 'max': 5000})]
+
+    def test_unknown(self, long_sheet):
+        with pytest.raises(ValueError):
+            long_sheet.aggregate(funcs=['median'])
+
+    def test_dates(self):
+        wb = load_workbook(os.path.join(DATADIR, 'genuine', 'empty.xlsx'),
+                           use_iterators=True)
+        stats = wb['Sheet4 - Dates'].aggregate(['A'], ['min', 'sum'])
+        assert stats['A'] == {'min': datetime.datetime(1973, 5, 20), 'sum': None}
+
+    def test_formulae(self, tmpdir):
+        from openpyxl.workbook import Workbook
+        filename = str(tmpdir.join('formulae.xlsx'))
+        wb = Workbook(optimized_write=True)
+        ws = wb.create_sheet()
+        for idx in range(1, 11):
+            ws.append([idx, '=A%d*2' % idx])
+        wb.save(filename)
+        wb = load_workbook(filename, use_iterators=True)
+        stats = wb.worksheets[0].aggregate(['A', 'B'], ['count', 'nulls', 'sum'])
+        assert stats['A'] == {'count': 10, 'nulls': 0, 'sum': 55}
+        assert stats['B'] == {'count': 0, 'nulls': 10, 'sum': None}
+
+    def test_sketch(self):
+        from openpyxl.worksheet.aggregate import DistinctSketch
+        sketch = DistinctSketch(k=256)
+        for idx in range(200):
+            sketch.add_hash(hash(str(idx % 100)) % 2 ** 64)
+        assert sketch.estimate() == 100
+        for idx in range(100000):
+            sketch.add_hash(hash(str(idx)) % 2 ** 64)
+        assert abs(sketch.estimate() - 100000) < 25000
+
+
+class TestTee:
+
+    def test_shared_rows(self):
+        from openpyxl.worksheet.fanout import SharedRows
+        shared = SharedRows(iter(range(100)), 3, buffer_rows=10)
+        fast, middle, slow = shared.consumers()
+        assert list(fast) == list(range(100))
+        assert len(shared._memory) <= 10
+        assert [next(middle) for i in range(50)] == list(range(50))
+        assert list(slow) == list(range(100))
+        assert list(middle) == list(range(50, 100))
+        assert shared.spilled == 90
+
+    def test_values(self, long_sheet):
+        expected = list(long_sheet.iter_values())
+        loader, validator = long_sheet.tee(values_only=True, buffer_rows=100)
+        assert next(validator) == (1, 2, 'row 1')
+        assert list(loader) == expected
+        assert list(validator) == expected[1:]
+
+    def test_cells(self, long_sheet):
+        first, second = long_sheet.tee(range_string='A1:D20', buffer_rows=5)
+        rows = list(first)
+        assert [[c.value for c in row] for row in second] == \
+            [[c.value for c in row] for row in rows]
+        assert rows[-1][2].value == 'row 20'
+        assert rows[0][3].value is None
+
+    def test_close(self):
+        from openpyxl.worksheet.fanout import SharedRows
+        shared = SharedRows(iter(range(100)), 2, buffer_rows=10)
+        fast, slow = shared.consumers()
+        assert [next(fast) for i in range(50)] == list(range(50))
+        spill = shared._file
+        assert shared.spilled == 40
+        slow.close()
+        assert shared._offsets.tolist() == []
+        assert list(slow) == []
+        assert next(fast) == 50
+        fast.close()
+        assert shared._file is None
+        assert spill.closed
+
+    def test_close_worksheet(self, long_sheet):
+        loader, validator = long_sheet.tee(values_only=True, buffer_rows=5)
+        with loader:
+            with validator:
+                for row in range(20):
+                    next(loader)
+                spill = validator.shared._file
+                assert spill is not None
+        assert spill.closed
+        assert list(loader) == []
+
+
+class TestSheetCache:
+
+    @pytest.mark.parametrize("memory", [0, 1024 * 1024])
+    def test_open(self, long_sheet, memory):
+        from openpyxl.reader.sheet_cache import SheetCache
+        archive = long_sheet.parent._archive
+        path = long_sheet.worksheet_path
+        cache = SheetCache(archive, memory)
+        first = cache.open(path)
+        second = cache.open(path)
+        assert first.read(100) == second.read(100)
+        first.seek(50)
+        second.seek(-50, 1)
+        assert second.read(10) == first.read(10)
+        assert second.tell() == 60
+        first.seek(0)
+        assert first.read() == archive.read(path)
+        cache.close()
+
+    @pytest.mark.parametrize("memory", [0, 1024 * 1024])
+    def test_workbook(self, long_sheet, memory):
+        filename = long_sheet.parent._archive.filename
+        wb = load_workbook(filename, use_iterators=True, cache_sheets=True,
+                           sheets_memory=memory)
+        ws = wb.worksheets[0]
+        assert ws.worksheet_path not in wb._sheet_cache
+        rows = list(ws.iter_values())
+        assert ws.worksheet_path in wb._sheet_cache
+        assert rows == list(long_sheet.iter_values())
+        ws.index_rows(interval=100)
+        assert list(ws.iter_values('A2050:C2051')) == [(2050, 4100, 'row 2050'),
+                                                      (2051, 4102, 'row 2051')]
+
+    def test_close(self, long_sheet):
+        filename = long_sheet.parent._archive.filename
+        wb = load_workbook(filename, use_iterators=True, cache_sheets=True,
+                           sheets_memory=0)
+        ws = wb.worksheets[0]
+        next(ws.iter_values())
+        cache = wb._sheet_cache
+        inflated = cache._files[ws.worksheet_path]
+        wb.close()
+        assert inflated.closed
+        assert cache._files == {}
+        assert wb._sheet_cache is None
+
+
+def test_several_workbooks():
+    """Each read-only workbook keeps its own tables"""
+    mac = load_workbook(os.path.join(DATADIR, 'reader', 'date_1904.xlsx'), use_iterators=True)
+    win = load_workbook(os.path.join(DATADIR, 'reader', 'date_1900.xlsx'), use_iterators=True)
+    mac_cell = list(mac['Sheet1'].iter_rows('A1'))[0][0]
+    win_cell = list(win['Sheet1'].iter_rows('A1'))[0][0]
+    assert mac_cell.value == win_cell.value == datetime.datetime(2011, 10, 31)
+    assert list(mac['Sheet1'].iter_values('A1')) == list(win['Sheet1'].iter_values('A1'))
@@ -200,7 +200,7 @@ def test_read_cell_formulae():
     src_file = os.path.join(DATADIR, "reader", "worksheet_formula.xml")
     wb = Workbook()
     ws = wb.active
-    fast_parse(ws, open(src_file), {}, {}, None)
+    fast_parse(ws, open(src_file, "rb"), {}, {}, None)
     b1 = ws['B1']
     assert b1.data_type == 'f'
     assert b1.value == '=CONCATENATE(A1,A2)'
@@ -406,3 +406,36 @@ def test_read_autofilter(datadir):
     wb = load_workbook("bug275.xlsx")
     ws = wb.active
     assert ws.auto_filter.ref == 'A1:B6'
+
+
+def test_read_worksheet_data():
+    from openpyxl.reader.worksheet import read_worksheet_data
+    xml = b"""<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+    <cols><col min="1" max="1" width="12"/></cols>
+    <sheetData>
+      <row r="1" ht="20"><c r="A1" t="s"><v>0</v></c><c r="B1" s="1"><f>A2*2</f><v>4</v></c></row>
+    </sheetData>
+    <mergeCells><mergeCell ref="C1:D1"/></mergeCells>
+    </worksheet>"""
+    head, rows, tail = read_worksheet_data(xml)
+    assert rows == [(1, '20', None, None,
+                     [('A1', None, '0', 's', None),
+                      ('B1', '1', '4', 'n', ('A2*2', None, None, None))])]
+    assert b'width="12"' in head
+    assert b'mergeCell' not in head
+    assert b'mergeCell' in tail
+    assert b'sheetData' not in head + tail
+
+
+@pytest.mark.parametrize("filename", ['empty.xlsx', 'merge_range.xlsx'])
+def test_read_workers(filename):
+    path = os.path.join(DATADIR, 'genuine', filename)
+    serial = load_workbook(path)
+    parallel = load_workbook(path, workers=2)
+    assert serial.get_sheet_names() == parallel.get_sheet_names()
+    for ws1, ws2 in zip(serial.worksheets, parallel.worksheets):
+        values1 = dict((k, c.value) for k, c in ws1._cells.items())
+        values2 = dict((k, c.value) for k, c in ws2._cells.items())
+        assert values1 == values2
+        assert ws1._merged_cells == ws2._merged_cells
+        assert ws1.formula_attributes == ws2.formula_attributes
@@ -24,10 +24,12 @@
 # Python stdlib imports
 import os.path
 
+import pytest
+
 # package imports
 from openpyxl.tests.helper import DATADIR
 from openpyxl.workbook import Workbook
-from openpyxl.writer.strings import create_string_table
+from openpyxl.writer.strings import create_string_table, StringCounter
 from openpyxl.reader.strings import read_string_table
 
 
@@ -66,4 +68,187 @@ def test_formatted_string_table():
         string_table = read_string_table(content)
         assert {0: 'Welcome', 1: 'to the best shop in town',  2: "     let's play "} == string_table
     finally:
-        handle.close()
\ No newline at end of file
+        handle.close()
+
+class TestLazyStringTable:
+
+    def _open(self, filename, **kw):
+        from openpyxl.reader.strings import LazyStringTable
+        with open(os.path.join(DATADIR, 'reader', filename), 'rb') as src:
+            return LazyStringTable(src, **kw)
+
+    def test_read(self):
+        table = self._open('sharedStrings.xml')
+        assert len(table) == 2
+        assert table[0] == 'This is cell A1 in Sheet 1'
+        assert table.get(1) == 'This is cell G5'
+        assert table.get(2) is None
+
+    @pytest.mark.parametrize("filename",
+                             ['sharedStrings.xml',
+                              'sharedStrings-emptystring.xml',
+                              'shared-strings-rich.xml'])
+    def test_same_as_dict(self, filename):
+        with open(os.path.join(DATADIR, 'reader', filename), 'rb') as src:
+            expected = read_string_table(src.read())
+        table = self._open(filename)
+        assert dict((idx, table[idx]) for idx in range(len(table))) == expected
+
+    def test_cache(self):
+        from sys import getsizeof
+        table = self._open('sharedStrings.xml', memory=getsizeof(u'This is cell G5'))
+        table[0]
+        table[1]
+        assert list(table._cache._data.keys()) == [1]
+
+    def test_prefixed(self):
+        from openpyxl.compat import BytesIO
+        from openpyxl.reader.strings import LazyStringTable
+        xml = b"""<x:sst xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+        <x:si><x:t>a</x:t></x:si><x:si><x:r><x:t>b</x:t></x:r><x:r><x:t>c</x:t></x:r></x:si>
+        </x:sst>"""
+        table = LazyStringTable(BytesIO(xml))
+        assert [table[0], table[1]] == ['a', 'bc']
+
+    def test_index(self):
+        from openpyxl.compat import BytesIO
+        from openpyxl.reader.strings import LazyStringTable
+        with open(os.path.join(DATADIR, 'reader', 'sharedStrings.xml'), 'rb') as src:
+            xml = src.read()
+        table = LazyStringTable(BytesIO(xml))
+        table = LazyStringTable(BytesIO(xml), index=table.index)
+        assert table[1] == 'This is cell G5'
+
+    @pytest.mark.parametrize("xml",
+                             [b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="0" uniqueCount="0"/>',
+                              b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"></sst>'])
+    def test_empty(self, xml):
+        from openpyxl.compat import BytesIO
+        from openpyxl.reader.strings import LazyStringTable
+        table = LazyStringTable(BytesIO(xml))
+        assert len(table) == 0
+        assert table.get(0) is None
+        assert table.index_of('a') is None
+
+
+class TestSqliteStringTable:
+
+    @pytest.mark.parametrize("filename",
+                             ['sharedStrings.xml',
+                              'sharedStrings-emptystring.xml',
+                              'shared-strings-rich.xml'])
+    def test_same_as_dict(self, filename):
+        from openpyxl.reader.strings import SqliteStringTable
+        with open(os.path.join(DATADIR, 'reader', filename), 'rb') as src:
+            expected = read_string_table(src.read())
+            src.seek(0)
+            table = SqliteStringTable(src, memory=0)
+        assert len(table) == len(expected)
+        assert dict((idx, table[idx]) for idx in range(len(table))) == expected
+        assert len(table._cache) == 0
+        path = table.path
+        table.close()
+        assert not os.path.exists(path)
+
+    def test_batches(self, monkeypatch):
+        from openpyxl.compat import BytesIO
+        from openpyxl.reader.strings import SqliteStringTable
+        xml = b"".join([b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">']
+                       + [b'<si><t>' + str(i).encode('ascii') + b'</t></si>' for i in range(25)]
+                       + [b'</sst>'])
+        monkeypatch.setattr(SqliteStringTable, "batch_size", 10)
+        table = SqliteStringTable(BytesIO(xml))
+        assert [table[i] for i in range(25)] == [str(i) for i in range(25)]
+        assert table.get(25) is None
+
+    @pytest.mark.parametrize("xml",
+                             [b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="0" uniqueCount="0"/>',
+                              b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"></sst>'])
+    def test_empty(self, xml):
+        from openpyxl.compat import BytesIO
+        from openpyxl.reader.strings import SqliteStringTable
+        table = SqliteStringTable(BytesIO(xml), memory=0)
+        assert len(table) == 0
+        assert table.get(0) is None
+        assert table.index_of('a') is None
+        path = table.path
+        table.close()
+        assert not os.path.exists(path)
+
+
+
+@pytest.mark.parametrize("kind", ['memory', 'lazy', 'sqlite'])
+def test_index_of(kind):
+    from openpyxl.compat import BytesIO
+    from openpyxl.reader.strings import LazyStringTable, SqliteStringTable
+    xml = b"".join([b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">']
+                   + [b'<si><t>' + str(i % 20).encode('ascii') + b'</t></si>' for i in range(25)]
+                   + [b'</sst>'])
+    if kind == 'memory':
+        table = read_string_table(xml)
+    elif kind == 'lazy':
+        table = LazyStringTable(BytesIO(xml))
+    else:
+        table = SqliteStringTable(BytesIO(xml))
+    assert table.index_of('7') == 7
+    assert table.index_of('3') == 3
+    assert table.index_of('missing') is None
+
+class TestSqliteStringTableBuilder:
+
+    def test_spill(self):
+        from openpyxl.writer.strings import SqliteStringTableBuilder
+        builder = SqliteStringTableBuilder(memory=1000)
+        keys = ['string %d' % idx for idx in range(50)]
+        assert [builder.add(key) for key in keys] == list(range(50))
+        assert builder.path is not None
+        assert len(builder.dct) < 50
+        # strings on disk keep their index
+        assert [builder.add(key) for key in keys] == list(range(50))
+        assert builder.get(' string 3 ') == 3
+        assert builder.get('missing') is None
+        assert builder.get_table() == dict((key, idx) for idx, key in enumerate(keys))
+        path = builder.path
+        builder.close()
+        assert not os.path.exists(path)
+
+    @pytest.mark.parametrize("memory", [0, 1000, 10 ** 6])
+    def test_write(self, memory):
+        from openpyxl.compat import BytesIO
+        from openpyxl.writer.strings import SqliteStringTableBuilder
+        builder = SqliteStringTableBuilder(memory=memory)
+        for idx in range(30):
+            builder.add(u'<%d> & \u20ac' % (idx % 20))
+        out = BytesIO()
+        builder.write(out)
+        builder.close()
+        table = read_string_table(out.getvalue())
+        assert table == dict((idx, u'<%d> & \u20ac' % idx) for idx in range(20))
+
+
+def test_load_lazy(tmpdir):
+    from openpyxl.reader.excel import load_workbook
+    from openpyxl.reader.strings import LazyStringTable
+    filename = os.path.join(DATADIR, 'genuine', 'empty.xlsx')
+    for cache_dir in (None, str(tmpdir), str(tmpdir)):
+        wb = load_workbook(filename, use_iterators=True, shared_strings='lazy',
+                           cache_dir=cache_dir)
+        ws = wb['Sheet1 - Text']
+        assert isinstance(ws.string_table, LazyStringTable)
+        assert ws['G5'].value == 'This is cell G5'
+    for shared_strings in ('lazy', 'sqlite'):
+        wb = load_workbook(filename, shared_strings=shared_strings)
+        assert wb['Sheet1 - Text']['G5'].value == 'This is cell G5'
+    with pytest.raises(ValueError):
+        load_workbook(filename, shared_strings='fast')
+
+
+def test_string_counter():
+    counter = StringCounter(width=1024)
+    assert [counter.add('repeated') for _ in range(3)] == [1, 2, 3]
+    # counts may be too high, never too low
+    assert counter.add('other') >= 1
+    for idx in range(1024):
+        counter.add('%d' % idx)
+    # counting started again
+    assert counter.add('repeated') == 1
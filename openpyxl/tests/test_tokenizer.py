@@ -0,0 +1,75 @@
+# Copyright (c) 2010-2014 openpyxl
+
+import pytest
+
+from openpyxl.compat import BytesIO
+from openpyxl.xml.functions import ENGINES
+from openpyxl.xml.constants import SHEET_MAIN_NS
+
+
+SHEET = b"""<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<cols><col min="1" max="2" width="12"/></cols>
+<sheetData>
+<row r="1" ht="20" s="2" customFormat="1">
+  <c r="A1" t="s"><v>0</v></c>
+  <c r="B1" s="1"><f t="shared" si="0" ref="B1:B2">A1*2</f><v>4</v></c>
+  <c r="C1" s="3"/>
+</row>
+<row r="3">
+  <c r="A3" t="inlineStr"><is><t> plain </t></is></c>
+  <c r="B3" t="inlineStr"><is><r><t xml:space="preserve">rich </t></r><r><rPr><b/></rPr><t>text</t></r><rPh><t>ignored</t></rPh></is></c>
+  <c r="C3"><f/><v>1</v></c>
+</row>
+</sheetData>
+<mergeCells count="1"><mergeCell ref="D1:E1"/></mergeCells>
+</worksheet>
+"""
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_rows(engine):
+    from openpyxl.worksheet.tokenizer import iter_rows
+    rows = list(iter_rows(BytesIO(SHEET), engine))
+    assert rows == [
+        (1, '20', '2', '1', [
+            ('A1', None, '0', 's', None),
+            ('B1', '1', '4', 'n', ('A1*2', 'shared', '0', 'B1:B2')),
+            ('C1', '3', None, 'n', None)]),
+        (3, -1, None, None, [
+            ('A3', None, 'plain', 'inlineStr', None),
+            ('B3', None, 'rich text', 'inlineStr', None),
+            ('C3', None, '1', 'n', (None, None, None, None))]),
+    ]
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_elements(engine):
+    from openpyxl.worksheet.tokenizer import iter_rows
+    tags = ['{%s}col' % SHEET_MAIN_NS, '{%s}mergeCells' % SHEET_MAIN_NS]
+    items = []
+    for item in iter_rows(BytesIO(SHEET), engine, tags):
+        if isinstance(item, tuple):
+            items.append(item[0])
+        elif item.tag == tags[0]:
+            items.append(item.get('width'))
+        else:
+            items.append(item.find('{%s}mergeCell' % SHEET_MAIN_NS).get('ref'))
+    assert items == ['12', 1, 3, 'D1:E1']
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_worksheet(engine):
+    from openpyxl.workbook import Workbook
+    from openpyxl.worksheet import Worksheet
+    from openpyxl.reader.worksheet import fast_parse
+    from openpyxl.styles import Style
+    ws = Worksheet(Workbook())
+    styles = dict((idx, Style()) for idx in range(4))
+    fast_parse(ws, BytesIO(SHEET), {0: 'shared'}, styles, engine=engine)
+    assert ws['A1'].value == 'shared'
+    assert ws['B1'].value == '=A1*2'
+    assert ws['A3'].value == 'plain'
+    assert ws['A3'].data_type == 's'
+    assert ws['B3'].value == 'rich text'
+    assert ws.row_dimensions[1].height == 20
+    assert ws._merged_cells == ['D1:E1']
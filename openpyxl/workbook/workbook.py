@@ -33,7 +33,9 @@ import threading
 # package imports
 from openpyxl.worksheet import Worksheet
 from openpyxl.writer.dump_worksheet import DumpWorksheet, save_dump
-from openpyxl.writer.strings import StringTableBuilder
+from openpyxl.writer.strings import (StringTableBuilder,
+                                     SqliteStringTableBuilder,
+                                     STRING_BUILDER_MEMORY)
 from openpyxl.namedrange import NamedRange
 from openpyxl.styles import Style
 from openpyxl.writer.excel import save_workbook
@@ -78,7 +80,14 @@ class Workbook(object):
                  worksheet_class=Worksheet,
                  optimized_worksheet_class=DumpWorksheet,
                  guess_types=False,
-                 data_only=False):
+                 data_only=False,
+                 shared_strings='memory',
+                 strings_memory=STRING_BUILDER_MEMORY):
+        """
+        With `optimized_write`, `shared_strings` can be 'sqlite' to move the
+        shared strings to a temporary database when they take more than
+        `strings_memory` bytes.
+        """
         self.worksheets = []
         self._active_sheet_index = 0
         self._named_ranges = []
@@ -88,7 +97,13 @@ class Workbook(object):
         self.__optimized_write = optimized_write
         self.__optimized_read = False
         self.__thread_local_data = threading.local()
-        self.strings_table_builder = StringTableBuilder()
+        if shared_strings == 'memory':
+            self.strings_table_builder = StringTableBuilder()
+        elif shared_strings == 'sqlite':
+            self.strings_table_builder = SqliteStringTableBuilder(strings_memory)
+        else:
+            raise ValueError("shared_strings must be 'memory' or 'sqlite'")
+        self._dump_number_formats = []
         self.loaded_theme = None
         self._worksheet_class = worksheet_class
         self._optimized_worksheet_class = optimized_worksheet_class
@@ -263,3 +278,17 @@ class Workbook(object):
             save_dump(self, filename)
         else:
             save_workbook(self, filename)
+
+    def close(self):
+        """
+        Release the files held by a read-only workbook: the archive and the
+        worksheets inflated with `cache_sheets`. Its worksheets cannot be read
+        afterwards.
+        """
+        cache = getattr(self, '_sheet_cache', None)
+        if cache is not None:
+            cache.close()
+            self._sheet_cache = None
+        archive = getattr(self, '_archive', None)
+        if archive is not None:
+            archive.close()
@@ -0,0 +1,156 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2014 openpyxl
+
+"""
+Column statistics computed from the raw rows of the tokenizer, without
+converting values or creating cells.
+
+Numbers are summed and compared as floats. Shared strings are only counted,
+by their index, so the string table is never read. Formulae count by their
+cached value.
+"""
+
+from heapq import heappush, heappop
+from string import digits as DIGITS
+
+from openpyxl.cell import column_index_from_string, get_column_letter
+from openpyxl.compat import OrderedDict
+from openpyxl.date_time import from_excel
+
+AGGREGATES = ('count', 'nulls', 'sum', 'min', 'max', 'distinct')
+DISTINCT_SKETCH_SIZE = 1024
+
+HASH_RANGE = 2 ** 64
+# keep equal raw text of different types apart, e.g. the number 5 and the
+# shared string with index 5
+TYPE_SALTS = {
+    's': 0x9E3779B97F4A7C15,
+    'b': 0xC2B2AE3D27D4EB4F,
+    'e': 0x165667B19E3779F9,
+    'str': 0x27D4EB2F165667C5,
+    'inlineStr': 0x85EBCA77C2B2AE63,
+}
+
+
+class DistinctSketch(object):
+    """
+    Estimate of the number of distinct values from the `k` smallest hashes
+    seen (KMV). Exact as long as fewer than `k` values are distinct, the
+    error is about 1 / sqrt(k) beyond that.
+    """
+
+    def __init__(self, k=DISTINCT_SKETCH_SIZE):
+        self.k = k
+        self.threshold = HASH_RANGE
+        self._heap = [] # negated, so the largest kept hash is first
+        self._seen = set()
+
+    def add_hash(self, h):
+        if h >= self.threshold or h in self._seen:
+            return
+        heappush(self._heap, -h)
+        self._seen.add(h)
+        if len(self._heap) > self.k:
+            self._seen.discard(-heappop(self._heap))
+            self.threshold = -self._heap[0]
+
+    def estimate(self):
+        if len(self._heap) < self.k:
+            return len(self._heap)
+        return int(round((self.k - 1) * HASH_RANGE / float(self.threshold)))
+
+
+class ColumnStats(object):
+
+    __slots__ = ('count', 'numbers', 'dates', 'total', 'minimum', 'maximum',
+                 'sketch')
+
+    def __init__(self, distinct=False):
+        self.count = self.numbers = self.dates = 0
+        self.total = 0.0
+        self.minimum = self.maximum = None
+        self.sketch = None
+        if distinct:
+            self.sketch = DistinctSketch()
+
+    def result(self, funcs, rows, base_date):
+        values = {
+            'count': self.count,
+            'nulls': rows - self.count,
+            'sum': None,
+            'min': self.minimum,
+            'max': self.maximum,
+        }
+        if self.numbers:
+            if self.dates == self.numbers:
+                values['min'] = from_excel(self.minimum, base_date)
+                values['max'] = from_excel(self.maximum, base_date)
+            else:
+                values['sum'] = self.total
+        if self.sketch is not None:
+            values['distinct'] = self.sketch.estimate()
+        return OrderedDict((func, values[func]) for func in funcs)
+
+
+def aggregate_rows(rows, columns=None, funcs=AGGREGATES, date_styles=(),
+                   base_date=None):
+    """
+    Statistics for every column in `columns` (letters), or every column with
+    values, over tokenized `rows`. `date_styles` are the ids of date styles
+    as strings: if every number of a column is a date its minimum and maximum
+    are dates and it has no sum.
+
+    Returns an ordered dictionary of column letters and ordered dictionaries
+    of `funcs` and their values. Nulls are the rows of the worksheet without
+    a value in the column, empty values included.
+    """
+    for func in funcs:
+        if func not in AGGREGATES:
+            raise ValueError("Unknown aggregate %s, use one of %s"
+                             % (func, ", ".join(AGGREGATES)))
+    distinct = 'distinct' in funcs
+    stats = OrderedDict()
+    if columns is not None:
+        for letters in columns:
+            stats[letters] = ColumnStats(distinct)
+    salts = TYPE_SALTS
+    count = 0
+    for _row, _height, _style, _custom, cells in rows:
+        count += 1
+        letters = None
+        for coord, style_id, value, data_type, _formula in cells:
+            if coord is None:
+                column = 1
+                if letters is not None:
+                    column = column_index_from_string(letters) + 1
+                letters = get_column_letter(column)
+            else:
+                letters = coord.rstrip(DIGITS)
+            if value is None or value == '':
+                # formulae without a cached value have an empty <v/>
+                continue
+            col = stats.get(letters)
+            if col is None:
+                if columns is not None:
+                    continue
+                col = stats[letters] = ColumnStats(distinct)
+            col.count += 1
+            if data_type == 'n':
+                number = float(value)
+                col.numbers += 1
+                col.total += number
+                if col.minimum is None or number < col.minimum:
+                    col.minimum = number
+                if col.maximum is None or number > col.maximum:
+                    col.maximum = number
+                if style_id in date_styles:
+                    col.dates += 1
+            if distinct:
+                col.sketch.add_hash((hash(value) ^ salts.get(data_type, 0))
+                                    % HASH_RANGE)
+    if columns is None:
+        order = sorted(stats, key=column_index_from_string)
+    else:
+        order = columns
+    return OrderedDict((letters, stats[letters].result(funcs, count, base_date))
+                       for letters in order)
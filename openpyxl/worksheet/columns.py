@@ -0,0 +1,146 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2014 openpyxl
+
+"""
+Column-oriented batches of values for read-only worksheets.
+"""
+
+from array import array
+
+from openpyxl.compat import OrderedDict, unicode
+from openpyxl.date_time import (SerialDate, from_excel, from_excel_many,
+                                from_excel_datetime64)
+from openpyxl.units import NUMERIC_TYPES
+
+NAN = float('nan')
+
+
+def is_numeric(values):
+    """Check whether a sequence contains only numbers and empty cells"""
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, NUMERIC_TYPES):
+            return False
+    return True
+
+
+def is_codes(values):
+    """Check whether a sequence contains shared string indices and empty cells"""
+    found = False
+    for value in values:
+        if value is None:
+            continue
+        if type(value) is not int:
+            return False
+        found = True
+    return found
+
+
+def is_dates(values):
+    """Check whether a sequence contains serial dates and empty cells"""
+    found = False
+    for value in values:
+        if value is None:
+            continue
+        if type(value) is not SerialDate:
+            return False
+        found = True
+    return found
+
+
+def make_date_column(values, numpy=None, base_date=None):
+    """
+    Convert a column of serial dates at once, to a datetime64 ndarray with
+    NaT for empty cells if the `numpy` module is given. Times, which have
+    no date, stay a column of objects.
+    """
+    if numpy is not None:
+        serials = numpy.array([NAN if v is None else v for v in values])
+        if not ((numpy.abs(serials) < 1) & (serials != 0)).any():
+            return from_excel_datetime64(serials, base_date)
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = from_excel_many(values, base_date)
+        return column
+    return from_excel_many(values, base_date)
+
+
+class StringColumn(object):
+    """
+    Shared strings of a column stored as their indices in the workbook's
+    string `table`, with -1 for empty cells. Excel writes every distinct
+    string once so equal strings have equal codes, which can be grouped or
+    joined on instead of the strings.
+    """
+
+    def __init__(self, codes, table):
+        self.codes = codes
+        self.table = table
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, idx):
+        code = self.codes[idx]
+        if code >= 0:
+            return unicode(self.table[code])
+
+    def __iter__(self):
+        for idx in range(len(self.codes)):
+            yield self[idx]
+
+
+def make_column(values, numpy=None, string_table=None, base_date=None):
+    """
+    Store a sequence of values compactly: numbers in an `array.array('d')`
+    with NaN for empty cells, anything else in a list. Serial dates, relative
+    to `base_date`, are converted by `make_date_column`.
+    If the `numpy` module is given these are converted to float64 and object
+    ndarrays.
+
+    If a `string_table` is given ints are shared strings: columns of only
+    shared strings become a `StringColumn` of `array.array('i')` codes (int32
+    ndarrays with numpy), in other columns the strings are looked up.
+    """
+    if string_table is not None:
+        if is_codes(values):
+            codes = array('i', [-1 if v is None else v for v in values])
+            if numpy is not None:
+                codes = numpy.frombuffer(codes, dtype=numpy.intc)
+            return StringColumn(codes, string_table)
+        values = [unicode(string_table[v]) if type(v) is int else v
+                  for v in values]
+    if base_date is not None:
+        if is_dates(values):
+            return make_date_column(values, numpy, base_date)
+        values = [from_excel(v, base_date) if type(v) is SerialDate else v
+                  for v in values]
+    if is_numeric(values):
+        column = array('d', [NAN if v is None else v for v in values])
+        if numpy is not None:
+            column = numpy.frombuffer(column, dtype=numpy.float64)
+        return column
+    if numpy is not None:
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+    return list(values)
+
+
+def make_batch(rows, columns, positions, numpy=None, string_table=None,
+               base_date=None):
+    """
+    Transpose a block of rows into an ordered dictionary of columns
+
+    :param rows: sequence of row tuples
+    :param columns: names of the columns in the batch
+    :param positions: position of each column within the rows
+    :param numpy: the numpy module, to get ndarrays
+    :param string_table: shared strings if they are given as their index
+    :param base_date: base date of serial dates if they are not converted
+    """
+    batch = OrderedDict()
+    for name, pos in zip(columns, positions):
+        batch[name] = make_column([row[pos] for row in rows], numpy,
+                                  string_table, base_date)
+    return batch
@@ -0,0 +1,141 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2014 openpyxl
+
+"""
+Several iterators over a single pass of rows.
+
+Like `itertools.tee` but the rows kept for iterators that fall behind are
+bounded in memory: beyond `buffer_rows` the oldest are written to a temporary
+file and read back from there. The file is closed once every iterator has
+been closed.
+"""
+
+import pickle
+from array import array
+from collections import deque
+from tempfile import TemporaryFile
+from threading import Lock
+
+from openpyxl.reader.strings import OFFSET_TYPE
+
+FANOUT_BUFFER_ROWS = 10000
+
+
+def _identity(row):
+    return row
+
+
+class SharedRows(object):
+    """
+    Rows from `source` shared by `n` consumers. `dump` and `load` convert rows
+    to and from something that can be pickled when they are spilled.
+    """
+
+    def __init__(self, source, n, buffer_rows=FANOUT_BUFFER_ROWS,
+                 dump=_identity, load=_identity):
+        self._source = iter(source)
+        self.positions = [0] * n
+        self.buffer_rows = buffer_rows
+        self._dump = dump
+        self._load = load
+        self._memory = deque()
+        self._memory_start = 0 # position of the first row in memory
+        self._end = 0 # position of the next row from the source
+        self._file = None
+        self._offsets = array(OFFSET_TYPE)
+        self._disk_start = 0 # position of the first row on disk
+        self._lock = Lock()
+        self.spilled = 0
+
+    def consumers(self):
+        return tuple(Consumer(self, idx) for idx in range(len(self.positions)))
+
+    def next_row(self, idx):
+        with self._lock:
+            pos = self.positions[idx]
+            if pos is None:
+                raise StopIteration
+            if pos == self._end:
+                row = next(self._source) # StopIteration ends every consumer
+                self._memory.append(row)
+                self._end += 1
+            elif pos >= self._memory_start:
+                row = self._memory[pos - self._memory_start]
+            else:
+                row = self._read(pos)
+            self.positions[idx] = pos + 1
+            self._trim()
+            return row
+
+    def release(self, idx):
+        """Stop keeping rows for consumer `idx`, close when none are left"""
+        with self._lock:
+            self.positions[idx] = None
+            if all(pos is None for pos in self.positions):
+                self.close()
+            else:
+                self._trim()
+
+    def _trim(self):
+        """Drop rows every consumer has seen and spill the excess"""
+        lowest = min(pos for pos in self.positions if pos is not None)
+        if self._offsets and lowest >= self._memory_start:
+            # nothing on disk is needed any more
+            self._file.seek(0)
+            self._file.truncate()
+            del self._offsets[:]
+        memory = self._memory
+        while memory and (self._memory_start < lowest
+                          or len(memory) > self.buffer_rows):
+            row = memory.popleft()
+            if self._memory_start >= lowest:
+                self._write(row)
+            self._memory_start += 1
+
+    def _write(self, row):
+        if self._file is None:
+            self._file = TemporaryFile()
+        if not self._offsets:
+            self._disk_start = self._memory_start
+        self._file.seek(0, 2)
+        self._offsets.append(self._file.tell())
+        pickle.dump(self._dump(row), self._file, pickle.HIGHEST_PROTOCOL)
+        self.spilled += 1
+
+    def _read(self, pos):
+        self._file.seek(self._offsets[pos - self._disk_start])
+        return self._load(pickle.load(self._file))
+
+    def close(self):
+        self._memory.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if hasattr(self._source, 'close'):
+            self._source.close()
+
+
+class Consumer(object):
+    """Iterator over the shared rows with its own position"""
+
+    def __init__(self, shared, idx):
+        self.shared = shared
+        self.idx = idx
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.shared.next_row(self.idx)
+
+    next = __next__
+
+    def close(self):
+        """Stop reading, the temporary file goes once all consumers are closed"""
+        self.shared.release(self.idx)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -26,11 +26,14 @@ from __future__ import absolute_import
 *Still very raw*
 """
 # stdlib
-import operator
-from itertools import groupby
+from bisect import bisect_right
+from multiprocessing import Pool
+from zipfile import ZipFile
+from string import digits as DIGITS
 
 # compatibility
-from openpyxl.compat import xrange
+from openpyxl.compat import xrange, unicode, OrderedDict
+from openpyxl.compat.functools import _CacheInfo as CacheInfo
 from openpyxl.xml.functions import iterparse
 
 # package
@@ -41,8 +44,18 @@ from openpyxl.cell import (
     get_column_letter,
     Cell
 )
-from openpyxl.cell.read_only import ReadOnlyCell, EMPTY_CELL
-from openpyxl.xml.functions import safe_iterator
+from openpyxl.cell.read_only import ReadOnlyCell, EMPTY_CELL, date_style_flags
+from openpyxl.date_time import from_excel, SerialDate
+from openpyxl.worksheet.columns import make_batch
+from openpyxl.worksheet.aggregate import aggregate_rows, AGGREGATES
+from openpyxl.worksheet.fanout import SharedRows, FANOUT_BUFFER_ROWS
+from openpyxl.worksheet.tokenizer import iter_rows
+from openpyxl.worksheet.row_index import (
+    build_row_index,
+    RowIndex,
+    SegmentReader,
+    ROW_INDEX_INTERVAL
+)
 from openpyxl.xml.constants import SHEET_MAIN_NS
 
 
@@ -65,11 +78,14 @@ def get_range_boundaries(range_string, row_offset=0, column_offset=1):
     return (min_col, min_row, max_col, max_row)
 
 
-def read_dimension(source):
+def read_dimension(source, engine=None):
     min_row = min_col =  max_row = max_col = None
     DIMENSION_TAG = '{%s}dimension' % SHEET_MAIN_NS
     DATA_TAG = '{%s}sheetData' % SHEET_MAIN_NS
-    it = iterparse(source, tag=[DIMENSION_TAG, DATA_TAG])
+    # attributes are known at the start of an element and parsing can stop
+    # before the rows when the dimension is missing
+    it = iterparse(source, tag=[DIMENSION_TAG, DATA_TAG], events=('start',),
+                   engine=engine)
     for _event, element in it:
         if element.tag == DIMENSION_TAG:
             dim = element.get("ref")
@@ -92,26 +108,154 @@ VALUE_TAG = '{%s}v' % SHEET_MAIN_NS
 FORMULA_TAG = '{%s}f' % SHEET_MAIN_NS
 DIMENSION_TAG = '{%s}dimension' % SHEET_MAIN_NS
 
+# segments per process when reading in parallel
+SEGMENTS_PER_WORKER = 4
+
+# blocks of rows between checkpoints of the row index kept for single cells
+CELL_CACHE_BLOCKS = 8
+
+
+def raw_values(cells):
+    """
+    Column letters and raw values of the cells of a row as seen by `where`
+    predicates: the text of numbers, dates and booleans, the index of shared
+    strings and the text of inline strings. Empty cells are None.
+    """
+    raw = {}
+    letters = None
+    for coord, _style, value, data_type, _formula in cells:
+        if coord is None:
+            column = 1
+            if letters is not None:
+                column = column_index_from_string(letters) + 1
+            letters = get_column_letter(column)
+        else:
+            letters = coord.rstrip(DIGITS)
+        if value is not None and data_type == Cell.TYPE_STRING:
+            value = int(value)
+        raw[letters] = value
+    return raw
+
+
+def read_values(source, min_row, min_col, max_row, max_col, string_table,
+                date_styles, base_date, data_only=False, engine=None,
+                columns=None, where=None, date_serials=False):
+    """
+    Parse a worksheet and yield the row number and a list of (column index,
+    value) for every row from `min_row` to `max_row`.
+
+    `date_styles` are the ids of date styles as strings. If `string_table`
+    is None shared strings are returned as their index, which is the only
+    case where a value is an int.
+
+    If given, only the column indices in `columns` are converted and only
+    rows for which `where` returns True for their `raw_values` are yielded.
+    With `date_serials` dates are returned as a `SerialDate` to be converted
+    by column.
+    """
+    indices = {}
+    for row, _height, _style, _custom, cells in iter_rows(source, engine):
+        if max_row is not None and row > max_row:
+            break
+        if row < min_row:
+            continue
+        if where is not None and not where(raw_values(cells)):
+            continue
+        values = []
+        column = 0
+        for coord, style_id, value, data_type, formula in cells:
+            if coord is None:
+                column += 1
+            else:
+                letters = coord.rstrip(DIGITS)
+                column = indices.get(letters)
+                if column is None:
+                    column = indices[letters] = column_index_from_string(letters)
+            if max_col is not None and column >= max_col:
+                break
+            if column < min_col:
+                continue
+            if columns is not None and column not in columns:
+                continue
+            if formula is not None and not data_only:
+                value = "=%s" % (formula[0] or '')
+            elif value is None:
+                pass
+            elif data_type == 'n':
+                value = float(value)
+                if style_id in date_styles:
+                    if date_serials:
+                        value = SerialDate(value)
+                    else:
+                        value = from_excel(value, base_date)
+            elif data_type == Cell.TYPE_STRING:
+                value = int(value)
+                if string_table is not None:
+                    value = unicode(string_table[value])
+            elif data_type == Cell.TYPE_BOOL:
+                value = value == '1'
+            elif data_type in (Cell.TYPE_INLINE, Cell.TYPE_FORMULA_CACHE_STRING):
+                value = unicode(value)
+            values.append((column, value))
+        yield row, values
+
+
+def read_segment(args):
+    """
+    Read the values of a range of rows starting at a checkpoint of the row
+    index. Used by worker processes which open the workbook themselves.
+    """
+    (filename, worksheet_path, data_offset, offset, min_row, min_col,
+     max_row, max_col, date_styles, base_date, data_only, engine, columns,
+     where, date_serials) = args
+    archive = ZipFile(filename)
+    try:
+        source = SegmentReader(archive.open(worksheet_path), data_offset, offset)
+        return list(read_values(source, min_row, min_col, max_row, max_col,
+                                None, date_styles, base_date, data_only,
+                                engine, columns, where, date_serials))
+    finally:
+        archive.close()
+
 
 class IterableWorksheet(Worksheet):
 
     min_col = 'A'
     min_row = 1
     max_col = max_row = None
+    row_index = None
+    xml_engine = None # default parser
+    cell_cache_blocks = CELL_CACHE_BLOCKS
+    _blocks = _blocks_index = _block_stats = _head = None
 
     def __init__(self, parent_workbook, title, worksheet_path,
-                 xml_source, string_table, style_table):
+                 xml_source, string_table, style_table, date_styles=None):
         Worksheet.__init__(self, parent_workbook, title)
         self.worksheet_path = worksheet_path
-        ReadOnlyCell.set_string_table(string_table)
-        ReadOnlyCell.set_style_table(style_table)
-        ReadOnlyCell.set_base_date(parent_workbook.excel_base_date)
-        dimensions = read_dimension(self.xml_source)
+        self.string_table = string_table
+        self.style_table = style_table
+        if date_styles is None:
+            date_styles = date_style_flags(style_table)
+        self.date_styles = date_styles
+        self.base_date = parent_workbook.excel_base_date
+        metadata = self._get_metadata()
+        if 'dimensions' in metadata:
+            dimensions = metadata['dimensions']
+        else:
+            # only the head is needed, don't inflate a whole cached worksheet
+            src = self.parent._archive.open(self.worksheet_path)
+            dimensions = read_dimension(src, self.xml_engine)
+            self._set_metadata(dimensions=dimensions)
         if dimensions is not None:
             self.min_col, self.min_row, self.max_col, self.max_row = dimensions
+        if metadata.get('row_index') is not None:
+            self.row_index = RowIndex.from_dict(metadata['row_index'])
 
     @property
     def xml_source(self):
+        cache = getattr(self.parent, '_sheet_cache', None)
+        if cache is not None:
+            return cache.open(self.worksheet_path)
         return self.parent._archive.open(self.worksheet_path)
 
     @xml_source.setter
@@ -119,6 +263,36 @@ class IterableWorksheet(Worksheet):
         """Base class is always supplied XML source, IteratableWorksheet obtains it on demand."""
         pass
 
+    def index_rows(self, interval=ROW_INDEX_INTERVAL):
+        """
+        Record the position of every `interval`th row of the worksheet.
+        Ranged reads will then start parsing at the closest preceding row
+        instead of at the top of the worksheet.
+        """
+        self.row_index = build_row_index(self.xml_source, interval)
+        if self.row_index is not None:
+            self._set_metadata(row_index=self.row_index.as_dict())
+        return self.row_index
+
+    def _get_metadata(self):
+        """Metadata stored in the workbook's cache, if it has one"""
+        cache = getattr(self.parent, '_metadata_cache', None)
+        if cache is None:
+            return {}
+        return cache.get(self.parent._archive.getinfo(self.worksheet_path))
+
+    def _set_metadata(self, **values):
+        cache = getattr(self.parent, '_metadata_cache', None)
+        if cache is not None:
+            cache.update(self.parent._archive.getinfo(self.worksheet_path),
+                         **values)
+
+    def _get_source(self, min_row):
+        """Worksheet source positioned as close to `min_row` as possible"""
+        if self.row_index is None:
+            return self.xml_source
+        return self.row_index.open_at(self.xml_source, min_row)
+
     @property
     def dimensions(self):
         if not all([self.max_col, self.max_row]):
@@ -132,7 +306,8 @@ class IterableWorksheet(Worksheet):
             return self.iter_rows(key)
         return self.cell(key)
 
-    def iter_rows(self, range_string='', row_offset=0, column_offset=1):
+    def iter_rows(self, range_string='', row_offset=0, column_offset=1,
+                  values_only=False, workers=None, columns=None, where=None):
         """ Returns a squared range based on the `range_string` parameter,
         using generators.
 
@@ -145,6 +320,18 @@ class IterableWorksheet(Worksheet):
         :param column_offset: additonal columns (e.g. 3)
         :type column: int
 
+        :param values_only: return tuples of cell values instead of cells
+        :type values_only: bool
+
+        :param workers: number of processes used to parse values (only with `values_only`)
+        :type workers: int
+
+        :param columns: letters of the only columns to return, in that order
+        :type columns: list
+
+        :param where: called with the `raw_values` of every row, rows are skipped unless it returns True
+        :type where: callable
+
         :rtype: generator
 
         """
@@ -158,29 +345,202 @@ class IterableWorksheet(Worksheet):
             min_row = self.min_row
             max_row = self.max_row
 
-        return self.get_squared_range(min_col, min_row, max_col, max_row)
+        if columns is not None:
+            columns = [column_index_from_string(c) for c in columns]
+            min_col = min(columns)
+            max_col = max(columns) + 1
 
-    def get_squared_range(self, min_col, min_row, max_col, max_row):
+        return self.get_squared_range(min_col, min_row, max_col, max_row,
+                                      values_only, workers, columns, where)
+
+    def iter_values(self, range_string='', row_offset=0, column_offset=1,
+                    workers=None, columns=None, where=None):
+        """Shortcut for `iter_rows(..., values_only=True)`"""
+        return self.iter_rows(range_string, row_offset, column_offset,
+                              values_only=True, workers=workers,
+                              columns=columns, where=where)
+
+    def iter_batches(self, batch_size=65536, columns=None, use_numpy=False,
+                     workers=None, where=None, string_codes=False):
+        """
+        Read the worksheet in blocks of `batch_size` rows stored by column.
+
+        Each batch is an ordered dictionary of column letters and values.
+        Columns of numbers are `array.array('d')` with NaN for empty cells,
+        other columns are lists. Dates are converted a column at a time, to
+        `datetime64[us]` arrays with `use_numpy` unless they are only times.
+
+        :param columns: letters of the columns to read, all by default
+        :type columns: list
+
+        :param use_numpy: return numpy arrays instead
+        :type use_numpy: bool
+
+        :param workers: number of processes used to parse the worksheet
+        :type workers: int
+
+        :param where: filter on raw values as for `iter_rows`
+        :type where: callable
+
+        :param string_codes: return columns of shared strings as a :class:`openpyxl.worksheet.columns.StringColumn` of their indices
+        :type string_codes: bool
+
+        :rtype: generator
+        """
+        numpy = None
+        if use_numpy:
+            try:
+                import numpy
+            except ImportError:
+                raise ImportError('You must install numpy to get columns as arrays')
+        if columns is None:
+            if self.max_col is None:
+                raise ValueError("Worksheet is unsized, columns must be given")
+            indices = list(range(column_index_from_string(self.min_col),
+                                 column_index_from_string(self.max_col) + 1))
+        else:
+            indices = [column_index_from_string(c) for c in columns]
+        letters = [get_column_letter(idx) for idx in indices]
+        positions = list(range(len(indices)))
+
+        string_table = None
+        if string_codes:
+            string_table = self.string_table
+        rows = self._get_squared_values(min(indices), self.min_row,
+                                        max(indices) + 1, self.max_row,
+                                        workers, indices, where, string_codes,
+                                        date_serials=True)
+        block = []
+        for row in rows:
+            block.append(row)
+            if len(block) == batch_size:
+                yield make_batch(block, letters, positions, numpy,
+                                 string_table, self.base_date)
+                block = []
+        if block:
+            yield make_batch(block, letters, positions, numpy,
+                             string_table, self.base_date)
+
+    def aggregate(self, columns=None, funcs=AGGREGATES):
+        """
+        Column statistics computed while parsing, without creating cells or
+        rows: any of 'count', 'nulls', 'sum', 'min', 'max' and 'distinct'
+        (an estimate for more than a thousand distinct values).
+
+        :param columns: letters of the columns, all columns with values by default
+        :type columns: list
+
+        :rtype: ordered dictionary of columns and dictionaries of results
+        """
+        rows = iter_rows(self.xml_source, self.xml_engine)
+        return aggregate_rows(rows, columns, funcs, self._date_style_ids(),
+                              self.base_date)
+
+    def tee(self, n=2, range_string='', values_only=False,
+            buffer_rows=FANOUT_BUFFER_ROWS, columns=None, where=None):
+        """
+        Return `n` independent iterators over the rows of a single pass.
+
+        Rows are kept for the iterators that fall behind, up to `buffer_rows`
+        in memory and in a temporary file beyond that. The iterators can be
+        used from different threads. Close them, or use them as context
+        managers, to release the file when they are not read to the end.
+
+        :rtype: tuple
+        """
+        rows = self.iter_rows(range_string, values_only=values_only,
+                              columns=columns, where=where)
+        if values_only:
+            shared = SharedRows(rows, n, buffer_rows)
+        else:
+            shared = SharedRows(rows, n, buffer_rows, self._dump_cells,
+                                self._load_cells)
+        return shared.consumers()
+
+    def _dump_cells(self, row):
+        return tuple(None if cell is EMPTY_CELL else
+                     (cell.row, cell.column, cell._value, cell.data_type,
+                      cell._style_id) for cell in row)
+
+    def _load_cells(self, row):
+        return tuple(EMPTY_CELL if cell is None else ReadOnlyCell(self, *cell)
+                     for cell in row)
+
+    def shared_string_index(self, value):
+        """
+        Index of `value` in the shared strings, which is how it appears in
+        the raw values passed to `where`, or None if it is not used.
+        """
+        return self.string_table.index_of(value)
+
+    def get_squared_range(self, min_col, min_row, max_col, max_row,
+                          values_only=False, workers=None, columns=None,
+                          where=None):
         """
         The source worksheet file may have columns or rows missing.
-        Missing cells will be created.
+        Missing cells will be created, missing rows only if there is no
+        `where` filter. `columns` are the indices of the columns to return.
         """
-        if max_col is not None:
+        if values_only:
+            return self._get_squared_values(min_col, min_row, max_col, max_row,
+                                            workers, columns, where)
+        return self._get_squared_cells(min_col, min_row, max_col, max_row,
+                                       columns, where)
+
+    def _get_squared_values(self, min_col, min_row, max_col, max_row,
+                            workers=None, columns=None, where=None,
+                            string_codes=False, date_serials=False):
+        """Rows of values, missing rows and cells are None"""
+        width = None
+        if columns is not None:
+            width = len(columns)
+        elif max_col is not None:
+            width = max_col - min_col
+        row_counter = min_row
+        for row, cells in self.get_values(min_row, min_col, max_row, max_col,
+                                          workers, columns, where,
+                                          string_codes, date_serials):
+            if row_counter < row and where is None:
+                empty = tuple([None] * (width or 0))
+                for gap_row in xrange(row_counter, row):
+                    yield empty
+            row_counter = row + 1
+            if columns is not None:
+                found = dict(cells)
+                yield tuple([found.get(column) for column in columns])
+                continue
+            if width is None:
+                if not cells:
+                    yield ()
+                    continue
+                values = [None] * (cells[-1][0] - min_col + 1)
+            else:
+                values = [None] * width
+            for column, value in cells:
+                values[column - min_col] = value
+            yield tuple(values)
+
+    def _get_squared_cells(self, min_col, min_row, max_col, max_row,
+                           columns=None, where=None):
+        if columns is not None:
+            expected_columns = [get_column_letter(ci) for ci in columns]
+        elif max_col is not None:
             expected_columns = [get_column_letter(ci) for ci in xrange(min_col, max_col)]
         else:
             expected_columns = []
         row_counter = min_row
 
         # get cells row by row
-        for row, cells in groupby(self.get_cells(min_row, min_col,
-                                                 max_row, max_col),
-                                  operator.attrgetter('row')):
+        for row, cells in self._get_cell_rows(min_row, min_col, max_row,
+                                              max_col, columns, where):
+            if not cells and where is None:
+                # filled in as a gap if rows follow
+                continue
             full_row = []
-            if row_counter < row:
+            if row_counter < row and where is None:
                 # Rows requested before those in the worksheet
                 for gap_row in xrange(row_counter, row):
                     yield tuple(EMPTY_CELL for column in expected_columns)
-                    row_counter = row
 
             if expected_columns:
                 retrieved_columns = dict([(c.column, c) for c in cells])
@@ -192,48 +552,257 @@ class IterableWorksheet(Worksheet):
                         # create missing cell
                         full_row.append(EMPTY_CELL)
             else:
-                full_row = tuple(cells)
+                full_row = cells
             row_counter = row + 1
             yield tuple(full_row)
 
 
     def get_cells(self, min_row, min_col, max_row, max_col):
-        p = iterparse(self.xml_source, tag=[ROW_TAG], remove_blank_text=True)
-        for _event, element in p:
-            if element.tag == ROW_TAG:
-                row = int(element.get("r"))
-                if max_row is not None and row > max_row:
-                    break
-                if min_row <= row:
-                    for cell in safe_iterator(element, CELL_TAG):
-                        coord = cell.get('r')
-                        column_str, row = coordinate_from_string(coord)
-                        column = column_index_from_string(column_str)
-                        if max_col is not None and column > max_col:
-                            break
-                        if min_col <= column:
-                            data_type = cell.get('t', 'n')
-                            style_id = cell.get('s')
-                            formula = cell.findtext(FORMULA_TAG)
-                            value = cell.findtext(VALUE_TAG)
-                            if formula is not None and not self.parent.data_only:
-                                data_type = Cell.TYPE_FORMULA
-                                value = "=%s" % formula
-                            yield ReadOnlyCell(row, column_str, value, data_type,
-                                          style_id)
-            if element.tag in (CELL_TAG, VALUE_TAG, FORMULA_TAG):
-                # sub-elements of rows should be skipped
+        for row, cells in self._get_cell_rows(min_row, min_col, max_row,
+                                              max_col):
+            for cell in cells:
+                yield cell
+
+    def _get_cell_rows(self, min_row, min_col, max_row, max_col, columns=None,
+                       where=None):
+        """
+        Yield the row number and a list of cells for every row, filtered like
+        the values of `get_values`
+        """
+        data_only = self.parent.data_only
+        indices = {}
+        rows = iter_rows(self._get_source(min_row), self.xml_engine)
+        for row, _height, _style, _custom, cells in rows:
+            if max_row is not None and row > max_row:
+                break
+            if row < min_row:
+                continue
+            if where is not None and not where(raw_values(cells)):
                 continue
-            element.clear()
+            row_cells = []
+            column = 0
+            for coord, style_id, value, data_type, formula in cells:
+                if coord is None:
+                    column += 1
+                    column_str = get_column_letter(column)
+                else:
+                    column_str = coord.rstrip(DIGITS)
+                    column = indices.get(column_str)
+                    if column is None:
+                        column = indices[column_str] = column_index_from_string(column_str)
+                if max_col is not None and column >= max_col:
+                    break
+                if column < min_col:
+                    continue
+                if columns is not None and column not in columns:
+                    continue
+                if formula is not None and not data_only:
+                    data_type = Cell.TYPE_FORMULA
+                    value = "=%s" % (formula[0] or '')
+                row_cells.append(ReadOnlyCell(self, row, column_str, value,
+                                              data_type, style_id))
+            yield row, row_cells
+
+
+    def get_values(self, min_row, min_col, max_row, max_col, workers=None,
+                   columns=None, where=None, string_codes=False,
+                   date_serials=False):
+        """
+        Converted values straight from the parser, without creating cells.
+        Yields the row number and a list of (column index, value) for
+        every row with cells from `min_col` up to but excluding `max_col`.
+
+        With `workers` segments of the worksheet between checkpoints of the
+        row index are parsed in that many processes, `where` must then be
+        picklable.
+
+        `columns`, `where` and `date_serials` are passed on to
+        `read_values`. With `string_codes` shared strings are returned as
+        their index.
+        """
+        if columns is not None:
+            columns = frozenset(columns)
+        if workers is not None and workers > 1:
+            segments = self._get_segments(min_row, max_row, workers)
+            if segments:
+                return self._get_values_parallel(segments, min_col, max_col,
+                                                 workers, columns, where,
+                                                 string_codes, date_serials)
+        string_table = self.string_table
+        if string_codes:
+            string_table = None
+        return read_values(self._get_source(min_row), min_row, min_col,
+                           max_row, max_col, string_table,
+                           self._date_style_ids(), self.base_date,
+                           self.parent.data_only, self.xml_engine,
+                           columns, where, date_serials)
+
+    def _date_style_ids(self):
+        # compare the raw attribute rather than converting it for every cell
+        return frozenset(str(idx) for idx, flag in enumerate(self.date_styles)
+                         if flag)
+
+    def _get_segments(self, min_row, max_row, workers):
+        """
+        Split the rows from `min_row` to `max_row` at checkpoints of the row
+        index into a few segments per worker. Returns a list of
+        (offset, min_row, max_row) or None if the worksheet cannot be split.
+        """
+        if self.parent._archive.filename is None:
+            # workers must be able to open the file themselves
+            return
+        index = self.row_index
+        if index is None:
+            index = self.index_rows()
+        if index is None:
+            return
+        rows = index.rows
+        first = max(bisect_right(rows, min_row) - 1, 0)
+        last = len(rows)
+        if max_row is not None:
+            last = bisect_right(rows, max_row)
+        if last - first < 2:
+            return
+        step = max(1, (last - first) // (workers * SEGMENTS_PER_WORKER))
+        segments = []
+        for idx in xrange(first, last, step):
+            stop = max_row
+            if idx + step < last:
+                stop = rows[idx + step] - 1
+            segments.append((index.offsets[idx], max(min_row, rows[idx]), stop))
+        return segments
+
+    def _get_values_parallel(self, segments, min_col, max_col, workers,
+                             columns=None, where=None, string_codes=False,
+                             date_serials=False):
+        string_table = self.string_table
+        filename = self.parent._archive.filename
+        data_offset = self.row_index.data_offset
+        date_styles = self._date_style_ids()
+        tasks = [(filename, self.worksheet_path, data_offset, offset, min_row,
+                  min_col, max_row, max_col, date_styles, self.base_date,
+                  self.parent.data_only, self.xml_engine, columns, where,
+                  date_serials)
+                 for offset, min_row, max_row in segments]
+        pool = Pool(min(workers, len(tasks)))
+        try:
+            for rows in pool.imap(read_segment, tasks):
+                if string_codes:
+                    for row in rows:
+                        yield row
+                    continue
+                for row, cells in rows:
+                    for idx, (column, value) in enumerate(cells):
+                        if type(value) is int:
+                            # shared strings are looked up here
+                            cells[idx] = column, unicode(string_table[value])
+                    yield row, cells
+        finally:
+            pool.terminate()
+            pool.join()
 
 
     def _get_cell(self, coordinate):
-        """.iter_rows always returns a generator of rows each of which
-        contains a generator of cells. This can be empty in which case
-        return None"""
-        result = list(self.iter_rows(coordinate))
-        if result:
-            return result[0][0]
+        """
+        Cells are read in blocks of rows between checkpoints of the row
+        index. Until a lookup goes past the first `ROW_INDEX_INTERVAL` rows
+        the worksheet is only read from the top as far as needed, then the
+        index is built. The most recently used blocks are kept so that
+        scattered lookups only parse the rows around them.
+        Missing cells of a row in the worksheet are empty cells if they are
+        within its dimensions. Returns None for cells of missing rows and
+        outside the dimensions.
+        """
+        coordinate = coordinate.upper()
+        column, row = coordinate_from_string(coordinate)
+        index = self.row_index
+        if index is None and row <= ROW_INDEX_INTERVAL:
+            cells, rows = self._get_head(row)
+        else:
+            if index is None:
+                self._close_head()
+                index = self.index_rows()
+            if index is None:
+                # no sheetData
+                return
+            checkpoint = index.find(row)
+            if checkpoint is None:
+                return
+            cells, rows = self._get_block(index, checkpoint[0])
+        cell = cells.get(coordinate)
+        if cell is None and row in rows:
+            idx = column_index_from_string(column)
+            if (column_index_from_string(self.min_col) <= idx
+                and (self.max_col is None
+                     or idx <= column_index_from_string(self.max_col))):
+                return EMPTY_CELL
+        return cell
+
+    def _get_block(self, index, start):
+        """
+        Cells by coordinate and the set of row numbers for the rows from the
+        checkpoint at `start`
+        """
+        if self._blocks is None or self._blocks_index is not index:
+            self._blocks = OrderedDict()
+            self._blocks_index = index
+            self._block_stats = [0, 0]
+        blocks = self._blocks
+        block = blocks.pop(start, None)
+        if block is not None:
+            self._block_stats[0] += 1
+        else:
+            self._block_stats[1] += 1
+            idx = bisect_right(index.rows, start)
+            max_row = None
+            if idx < len(index.rows):
+                max_row = index.rows[idx] - 1
+            cells, rows = block = ({}, set())
+            for row, row_cells in self._get_cell_rows(start, 1, max_row, None):
+                rows.add(row)
+                for cell in row_cells:
+                    cells[cell.coordinate] = cell
+            while len(blocks) >= self.cell_cache_blocks:
+                blocks.popitem(last=False)
+        blocks[start] = block
+        return block
+
+    def _get_head(self, row):
+        """
+        Cells by coordinate and the set of row numbers of the first rows,
+        read from the top of the worksheet up to at least `row`
+        """
+        if self._head is None:
+            rows = self._get_cell_rows(1, 1, ROW_INDEX_INTERVAL, None)
+            self._head = ({}, set(), rows, [0])
+        cells, row_numbers, rows, last = self._head
+        while last[0] < row:
+            try:
+                last[0], row_cells = next(rows)
+            except StopIteration:
+                last[0] = ROW_INDEX_INTERVAL
+                break
+            row_numbers.add(last[0])
+            for cell in row_cells:
+                cells[cell.coordinate] = cell
+        return cells, row_numbers
+
+    def _close_head(self):
+        if self._head is not None:
+            self._head[2].close()
+            self._head = None
+
+    def cell_cache_info(self):
+        """
+        Statistics of the block cache used to look up single cells, like
+        those of `functools.lru_cache`: hits, misses, maximum and current
+        number of blocks. Lookups in the first `ROW_INDEX_INTERVAL` rows are
+        not counted as long as there is no row index. The first lookup past
+        them builds it, which is a single pass over the worksheet.
+        """
+        hits, misses = self._block_stats or (0, 0)
+        return CacheInfo(hits, misses, self.cell_cache_blocks,
+                         len(self._blocks or ()))
 
 
     def range(self, *args, **kwargs):
@@ -0,0 +1,159 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2014 openpyxl
+
+"""
+Byte offsets of rows in the uncompressed xml of a worksheet.
+
+Only every nth row is recorded. Parsing a range of rows can then resume at
+the nearest preceding checkpoint instead of at the top of the worksheet.
+The scan works on the raw bytes and does not parse any xml.
+"""
+
+import re
+from bisect import bisect_right
+
+ROW_INDEX_INTERVAL = 1000
+CHUNK_SIZE = 64 * 1024
+
+SHEET_DATA_RE = re.compile(b'<(?:\\w+:)?sheetData(?:\\s[^>]*)?/?>')
+ROW_RE = re.compile(b'<(?:\\w+:)?row\\s[^>]*?\\br=["\'](\\d+)["\']')
+
+
+class RowIndex(object):
+    """
+    Checkpoints for a worksheet:
+
+    `data_offset` is the position just after the opening sheetData tag,
+    `rows` and `offsets` the number and position of every indexed row.
+    """
+
+    def __init__(self, data_offset, rows=None, offsets=None,
+                 interval=ROW_INDEX_INTERVAL):
+        self.data_offset = data_offset
+        self.rows = rows or []
+        self.offsets = offsets or []
+        self.interval = interval
+
+    def __len__(self):
+        return len(self.rows)
+
+    def as_dict(self):
+        return {'data_offset': self.data_offset, 'rows': self.rows,
+                'offsets': self.offsets, 'interval': self.interval}
+
+    @classmethod
+    def from_dict(cls, value):
+        return cls(value['data_offset'], value['rows'], value['offsets'],
+                   value['interval'])
+
+    def find(self, row):
+        """Return the last checkpoint (row, offset) at or before `row`"""
+        idx = bisect_right(self.rows, row) - 1
+        if idx < 0:
+            return
+        return self.rows[idx], self.offsets[idx]
+
+    def open_at(self, source, row):
+        """
+        Return a file-like object for the worksheet from the checkpoint
+        closest to `row` or `source` itself if there is none
+        """
+        checkpoint = self.find(row)
+        if checkpoint is None:
+            return source
+        return SegmentReader(source, self.data_offset, checkpoint[1])
+
+
+def _chunks(source, size=CHUNK_SIZE):
+    while True:
+        chunk = source.read(size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def build_row_index(source, interval=ROW_INDEX_INTERVAL):
+    """
+    Scan the uncompressed xml of a worksheet and record the offset of the
+    first row and of every `interval`th row after it.
+
+    Returns None if the worksheet has no sheetData.
+    """
+    data_offset = None
+    rows = []
+    offsets = []
+    count = 0
+    position = 0 # offset of `buf` in the stream
+    buf = b''
+    for chunk in _chunks(source):
+        buf += chunk
+        # a tag can be split between chunks so keep everything from the last
+        # opening bracket for the next round
+        cut = buf.rfind(b'<')
+        if cut < 0:
+            cut = len(buf)
+        scan = buf[:cut]
+        start = 0
+        if data_offset is None:
+            match = SHEET_DATA_RE.search(scan)
+            if match is not None:
+                if match.group().endswith(b'/>'):
+                    return RowIndex(position + match.end(), interval=interval)
+                data_offset = position + match.end()
+                start = match.end()
+        if data_offset is not None:
+            for match in ROW_RE.finditer(scan, start):
+                if count % interval == 0:
+                    rows.append(int(match.group(1)))
+                    offsets.append(position + match.start())
+                count += 1
+        position += cut
+        buf = buf[cut:]
+    if data_offset is None:
+        return
+    return RowIndex(data_offset, rows, offsets, interval)
+
+
+def skip(source, size):
+    """Advance a stream by `size` bytes"""
+    if hasattr(source, 'seekable') and source.seekable():
+        source.seek(size, 1)
+        return
+    while size > 0:
+        chunk = source.read(min(size, CHUNK_SIZE))
+        if not chunk:
+            break
+        size -= len(chunk)
+
+
+class SegmentReader(object):
+    """
+    File-like object that returns the head of a worksheet up to and
+    including the opening sheetData tag followed by the rest of the
+    worksheet from `offset`.
+
+    The result is a well-formed document containing only the rows from the
+    checkpoint onwards.
+    """
+
+    def __init__(self, source, data_offset, offset):
+        self.source = source
+        self._head = data_offset
+        self._gap = offset - data_offset
+
+    def read(self, size=-1):
+        if self._head:
+            if size < 0 or size >= self._head:
+                head = self.source.read(self._head)
+                self._head = 0
+                skip(self.source, self._gap)
+                if size < 0:
+                    return head + self.source.read()
+                return head
+            head = self.source.read(size)
+            self._head -= len(head)
+            return head
+        return self.source.read(size)
+
+    def close(self):
+        self.source.close()
@@ -0,0 +1,90 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2014 openpyxl
+
+"""
+Rows of a worksheet as tuples of the raw strings in the xml.
+
+A row is (index, height, style id, custom format, cells) and each cell is
+(coordinate, style id, value, data type, formula) where formula is None or
+(text, type, shared index, range). The value of an inline string is its text.
+
+Rows are read from the elements built by one of the engines in
+:mod:`openpyxl.xml.functions`.
+"""
+
+from openpyxl.compat import unicode
+from openpyxl.xml.constants import SHEET_MAIN_NS, XML_NS
+from openpyxl.xml.functions import get_engine, safe_iterator
+
+ROW_TAG = '{%s}row' % SHEET_MAIN_NS
+CELL_TAG = '{%s}c' % SHEET_MAIN_NS
+VALUE_TAG = '{%s}v' % SHEET_MAIN_NS
+FORMULA_TAG = '{%s}f' % SHEET_MAIN_NS
+INLINE_TAG = '{%s}is' % SHEET_MAIN_NS
+RICH_TAG = '{%s}r' % SHEET_MAIN_NS
+TEXT_TAG = '{%s}t' % SHEET_MAIN_NS
+SPACE_ATTR = '{%s}space' % XML_NS
+
+
+def read_text(element):
+    """Text of a <t> element, stripped unless spaces are preserved"""
+    text = element.text or unicode('')
+    if element.get(SPACE_ATTR) != 'preserve':
+        text = text.strip()
+    return text
+
+
+def read_inline(element):
+    """Text of an inline string, without phonetic runs"""
+    runs = element.findall(RICH_TAG)
+    if not runs:
+        runs = [element]
+    parts = []
+    for run in runs:
+        text = run.find(TEXT_TAG)
+        if text is not None:
+            parts.append(read_text(text))
+    return unicode('').join(parts)
+
+
+def read_cell(element):
+    """
+    Raw data of a cell: coordinate, style id, value, data type and formula,
+    which is either None or a tuple of text, type, shared index and range
+    """
+    data_type = element.get('t', 'n')
+    if data_type == 'inlineStr':
+        inline = element.find(INLINE_TAG)
+        value = None
+        if inline is not None:
+            value = read_inline(inline)
+    else:
+        value = element.findtext(VALUE_TAG)
+    formula = element.find(FORMULA_TAG)
+    if formula is not None:
+        formula = (formula.text, formula.get('t'), formula.get('si'),
+                   formula.get('ref'))
+    return element.get('r'), element.get('s'), value, data_type, formula
+
+
+def read_row(element):
+    """Raw data of a row: index, height, style id, custom format and cells"""
+    cells = [read_cell(cell) for cell in safe_iterator(element, CELL_TAG)]
+    return (int(element.get('r')), element.get('ht', -1), element.get('s'),
+            element.get('customFormat'), cells)
+
+
+def iter_rows(source, engine=None, elements=()):
+    """
+    Yield a tuple for every row of a worksheet and the element for every tag
+    in `elements`, which must be outside sheetData. Elements may be cleared
+    once the next item is requested.
+    """
+    tags = [ROW_TAG]
+    tags.extend(elements)
+    for _event, element in get_engine(engine).iterparse(source, tags):
+        if element.tag == ROW_TAG:
+            yield read_row(element)
+        else:
+            yield element
+        element.clear()
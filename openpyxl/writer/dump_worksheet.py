@@ -27,10 +27,11 @@ from __future__ import absolute_import
 import datetime
 import os
 from tempfile import NamedTemporaryFile
+from xml.sax.saxutils import escape
 
-from openpyxl.compat import OrderedDict
+from openpyxl.compat import OrderedDict, StringIO
 
-from openpyxl.cell import  get_column_letter, Cell
+from openpyxl.cell import get_column_letter
 from openpyxl.worksheet import Worksheet
 from openpyxl.xml.functions import (XMLGenerator, start_tag, end_tag, tag)
 from openpyxl.date_time import to_excel
@@ -38,33 +39,81 @@ from openpyxl.xml.constants import MAX_COLUMN, MAX_ROW
 from openpyxl.units import NUMERIC_TYPES
 from openpyxl.exceptions import WorkbookAlreadySaved
 from openpyxl.writer.excel import ExcelWriter
-from openpyxl.writer.strings import write_string_table
+from openpyxl.writer.strings import StringCounter
 from openpyxl.writer.styles import StyleWriter
 from openpyxl.styles import Style, NumberFormat
 
 from openpyxl.xml.constants import (ARC_SHARED_STRINGS, PACKAGE_WORKSHEETS)
 
-STYLES = {'datetime' : {'type':Cell.TYPE_NUMERIC,
-                        'style':'1'},
-          'string':{'type':Cell.TYPE_STRING,
-                    'style':'0'},
-          'numeric':{'type':Cell.TYPE_NUMERIC,
-                     'style':'0'},
-          'formula':{'type':Cell.TYPE_FORMULA,
-                    'style':'0'},
-          'boolean':{'type':Cell.TYPE_BOOL,
-                    'style':'0'},
-        }
-
 DESCRIPTORS_CACHE_SIZE = 50
+# characters of xml kept for a worksheet before they are written
+BUFFER_SIZE = 128 * 1024
+# rows formatted together by append_rows()
+ROWS_PER_WRITE = 1000
+
+# rows and cells are formatted directly, only formulae need escaping
+ROW = '<row r="%s" spans="1:%d">'
+NUMERIC_CELL = '<c r="%s" t="n"><v>%s</v></c>'
+DATETIME_CELL = '<c r="%s" t="n" s="1"><v>%s</v></c>'
+BOOLEAN_CELL = '<c r="%s" t="b"><v>%s</v></c>'
+STRING_CELL = '<c r="%s" t="s"><v>%s</v></c>'
+FORMULA_CELL = '<c r="%s"><f>%s</f><v></v></c>'
+INLINE_CELL = '<c r="%s" t="inlineStr"><is><t xml:space="preserve">%s</t></is></c>'
+# cells of columns with a number format, formatted with their style id first
+STYLED_NUMERIC_CELL = '<c r="%%s" t="n" s="%d"><v>%%s</v></c>'
+
+# types of set_schema(), any other string is the number format of a number
+# column
+COLUMN_TYPES = ('number', 'date', 'bool', 'string', 'inline', 'formula')
+# the first style of the optimized writer is for dates
+FIRST_NUMBER_FORMAT_STYLE = 2
+
+STRING_MODES = ('shared', 'inline', 'hybrid')
+# times a string is seen before it is shared in hybrid mode
+SHARED_STRING_MIN_COUNT = 3
 
 DATETIME_STYLE = Style()
 DATETIME_STYLE.number_format.format_code = NumberFormat.FORMAT_DATE_YYYYMMDD2
 BOUNDING_BOX_PLACEHOLDER = 'A1:%s%d' % (get_column_letter(MAX_COLUMN), MAX_ROW)
 
+def _inline_text(value):
+    # stripped like the strings of the shared string table
+    return escape(value.strip())
+
+def _formula_text(value):
+    if value[:1] == '=':
+        value = value[1:]
+    return escape(value)
+
+def _serial(value):
+    """Serial of a date for a date column, numbers are serials already"""
+    if isinstance(value, NUMERIC_TYPES):
+        return value
+    return to_excel(value)
+
+def _encoder(template, convert):
+    """Function formatting a cell of a declared column"""
+    if convert is None:
+        def encode(coordinate, value):
+            if value != value:
+                # NaN from numpy
+                return ''
+            return template % (coordinate, value)
+    elif convert is _serial:
+        def encode(coordinate, value):
+            value = _serial(value)
+            if value != value:
+                return ''
+            return template % (coordinate, value)
+    else:
+        def encode(coordinate, value):
+            return template % (coordinate, convert(value))
+    return encode
+
 def create_temporary_file(suffix=''):
     fobj = NamedTemporaryFile(mode='w+', suffix=suffix, prefix='openpyxl.', delete=False)
     filename = fobj.name
+    fobj.close()
     return filename
 
 class DumpWorksheet(Worksheet):
@@ -81,11 +130,19 @@ class DumpWorksheet(Worksheet):
         self._max_row = 0
         self._parent = parent_workbook
 
-        self._fileobj_header_name = create_temporary_file(suffix='.header')
-        self._fileobj_content_name = create_temporary_file(suffix='.content')
+        # the header is written first with room for the largest dimension,
+        # rows follow and the real dimension is filled in when closing
         self._fileobj_name = create_temporary_file()
+        self._dimension_offset = None
+        self._buffer = []
+        self._buffered = 0
+        self._column_letters = []
+        self._schema = self._encoders = self._row_template = None
 
         self._string_builder = self._parent.strings_table_builder
+        self._string_mode = 'shared'
+        self._string_cell = self._get_string_cell('shared')
+        self.write_header()
 
 
     def get_temporary_file(self, filename):
@@ -101,7 +158,7 @@ class DumpWorksheet(Worksheet):
                 raise WorkbookAlreadySaved('this workbook has already been saved '
                         'and cannot be modified or saved anymore.')
 
-            fobj = open(filename, 'r+')
+            fobj = open(filename, 'rb+')
             self._descriptors_cache[filename] = fobj
             if len(self._descriptors_cache) > DESCRIPTORS_CACHE_SIZE:
                 filename, fileobj = self._descriptors_cache.popitem(last=False)
@@ -122,19 +179,16 @@ class DumpWorksheet(Worksheet):
 
     @property
     def _temp_files(self):
-        return (self._fileobj_content_name,
-                self._fileobj_header_name,
-                self._fileobj_name)
+        return (self._fileobj_name,)
 
     def _unset_temp_files(self):
-        self._fileobj_header_name = None
-        self._fileobj_content_name = None
         self._fileobj_name = None
 
     def write_header(self):
 
-        fobj = self.get_temporary_file(filename=self._fileobj_header_name)
-        doc = XMLGenerator(fobj, 'utf-8')
+        fobj = self.get_temporary_file(filename=self._fileobj_name)
+        header = StringIO()
+        doc = XMLGenerator(header, 'utf-8')
 
         start_tag(doc, 'worksheet',
                 {
@@ -145,7 +199,7 @@ class DumpWorksheet(Worksheet):
                 {'summaryBelow': '1',
                 'summaryRight': '1'})
         end_tag(doc, 'sheetPr')
-        tag(doc, 'dimension', {'ref': 'A1:%s' % (self.get_dimensions())})
+        tag(doc, 'dimension', {'ref': BOUNDING_BOX_PLACEHOLDER})
         start_tag(doc, 'sheetViews')
         start_tag(doc, 'sheetView', {'workbookViewId': '0'})
         tag(doc, 'selection', {'activeCell': 'A1',
@@ -154,32 +208,23 @@ class DumpWorksheet(Worksheet):
         end_tag(doc, 'sheetViews')
         tag(doc, 'sheetFormatPr', {'defaultRowHeight': '15'})
         start_tag(doc, 'sheetData')
+        header = header.getvalue()
+        self._dimension_offset = fobj.tell() + header.index(BOUNDING_BOX_PLACEHOLDER)
+        fobj.write(header.encode('utf-8'))
 
     def close(self):
         self._close_content()
-        self._fileobj = self.get_temporary_file(filename=self._fileobj_name)
-        self._write_fileobj(self._fileobj_header_name)
-        self._write_fileobj(self._fileobj_content_name)
-        self._fileobj.close()
-
-    def _write_fileobj(self, fobj_name):
-        fobj = self.get_temporary_file(filename=fobj_name)
-        fobj.flush()
-        fobj.seek(0)
-
-        while True:
-            chunk = fobj.read(4096)
-            if not chunk:
-                break
-            self._fileobj.write(chunk)
-
+        fobj = self.get_temporary_file(filename=self._fileobj_name)
+        # overwrite the placeholder and its closing quote, whitespace before
+        # the end of the tag is allowed
+        ref = 'A1:%s"' % self.get_dimensions()
+        fobj.seek(self._dimension_offset)
+        fobj.write(ref.ljust(len(BOUNDING_BOX_PLACEHOLDER) + 1).encode('utf-8'))
         fobj.close()
-        self._fileobj.flush()
 
     def _close_content(self):
-        doc = self._get_content_generator()
-        end_tag(doc, 'sheetData')
-        end_tag(doc, 'worksheet')
+        self._write('</sheetData></worksheet>')
+        self._flush()
 
     def get_dimensions(self):
         if not self._max_col or not self._max_row:
@@ -187,68 +232,292 @@ class DumpWorksheet(Worksheet):
         else:
             return '%s%d' % (get_column_letter(self._max_col), (self._max_row))
 
-    def _get_content_generator(self):
-        """ XXX: this is ugly, but it allows to resume writing the file
-        even after the handle is closed"""
-
-        # when I'll recreate the XMLGenerator, it will start writing at the
-        # begining of the file, erasing previously entered rows, so we have
-        # to move to the end of the file before adding new tags
-        handle = self.get_temporary_file(filename=self._fileobj_content_name)
+    def _write(self, data):
+        """Buffer xml for the file, which is only opened to flush it"""
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered >= BUFFER_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        handle = self.get_temporary_file(filename=self._fileobj_name)
+        # the handle may have been reopened by the cache
         handle.seek(0, 2)
-
-        doc = XMLGenerator(out=handle)
-
-        return doc
+        handle.write(''.join(self._buffer).encode('utf-8'))
+        self._buffer = []
+        self._buffered = 0
 
     def append(self, row):
         """
         :param row: iterable containing values to append
         :type row: iterable
         """
-        doc = self._get_content_generator()
-        self._max_row += 1
-        span = len(row)
-        self._max_col = max(self._max_col, span)
-        row_idx = self._max_row
-        attrs = {'r': '%d' % row_idx,
-                 'spans': '1:%d' % span}
-        start_tag(doc, 'row', attrs)
+        self.append_rows((row,))
 
+    def append_rows(self, rows):
+        """
+        Append many rows in one go.
+
+        :param rows: iterable of rows or a two-dimensional numpy array
+
+        Numeric arrays are formatted with a single template unless the sheet
+        has a schema, which applies to arrays like to any other rows.
+        """
+        if self._fileobj_name is None:
+            raise WorkbookAlreadySaved('this workbook has already been saved '
+                    'and cannot be modified or saved anymore.')
+        if getattr(rows, 'ndim', None) == 2:
+            kind = rows.dtype.kind
+            if kind in 'iuf' and self._encoders is None:
+                self._append_numeric(rows)
+                return
+            if kind == 'M':
+                rows = rows.astype('datetime64[us]')
+            rows = rows.tolist()
+
+        xml = []
+        size = 0
+        for row in rows:
+            self._max_row += 1
+            self._row_xml(row, '%d' % self._max_row, xml)
+            size += 1
+            if size == ROWS_PER_WRITE:
+                self._write(''.join(xml))
+                xml = []
+                size = 0
+        if xml:
+            self._write(''.join(xml))
+
+    def set_schema(self, schema):
+        """
+        Declare the type of every column, so that the values of the following
+        rows are written without checking their type.
+
+        :param schema: one type per column: 'number', 'date', 'bool',
+            'string' (shared string), 'inline' (inline string), 'formula'
+            or None to check the values as usual. A number format code
+            instead of a type, or a tuple of 'number' or 'date' and a number
+            format code, sets the format of the column. None drops the schema.
+
+        Rows as long as a schema without None are formatted with a single
+        template. Empty cells are still written as None, numbers in date
+        columns are taken as serial dates.
+        """
+        self._schema = schema
+        self._encoders = self._row_template = None
+        if schema is None:
+            return
+        columns = [self._get_column(column) for column in schema]
+        # columns without a template are encoded cell by cell
+        self._encoders = [convert if template is None
+                          else _encoder(template, convert)
+                          for template, convert in columns]
+        if not columns or None in [template for template, _convert in columns]:
+            return
+        letters = self._get_letters(len(columns))
+        self._row_template = ''.join(
+            [ROW % ('{0}', len(columns))] +
+            [template % (letters[idx] + '{0}', '{%d}' % (idx + 1))
+             for idx, (template, _convert) in enumerate(columns)] +
+            ['</row>'])
+        self._converters = [(idx, convert)
+                            for idx, (_template, convert) in enumerate(columns)
+                            if convert is not None]
+        # NaN in columns of numbers or dates has to be left out
+        self._number_columns = [idx
+                                for idx, (_template, convert) in enumerate(columns)
+                                if convert is None or convert is _serial]
+
+    def _get_column(self, column):
+        """Cell template and conversion of the values of a declared column"""
+        format_code = None
+        if isinstance(column, tuple):
+            column, format_code = column
+            if column not in ('number', 'date'):
+                raise ValueError("Only number and date columns can have "
+                                 "a number format, not %s" % column)
+        elif column is not None and column not in COLUMN_TYPES:
+            column, format_code = 'number', column
+
+        if column is None:
+            return None, self._cell_xml
+        if column == 'number':
+            if format_code is None:
+                return NUMERIC_CELL, None
+            return STYLED_NUMERIC_CELL % self._number_format_style(format_code), None
+        if column == 'date':
+            if format_code is None:
+                return DATETIME_CELL, _serial
+            return STYLED_NUMERIC_CELL % self._number_format_style(format_code), _serial
+        if column == 'bool':
+            return BOOLEAN_CELL, int
+        if column == 'string':
+            if self._string_mode == 'shared':
+                return STRING_CELL, self._string_builder.add
+            if self._string_mode == 'inline':
+                return INLINE_CELL, _inline_text
+            return None, self._string_cell
+        if column == 'inline':
+            return INLINE_CELL, _inline_text
+        return FORMULA_CELL, _formula_text
+
+    def set_string_mode(self, mode, min_count=SHARED_STRING_MIN_COUNT):
+        """
+        Choose how the strings of the following rows are written.
+
+        :param mode: 'shared' in the shared string table of the workbook,
+            which grows with every distinct string, 'inline' in the cells
+            themselves, or 'hybrid': strings are inline until they have been
+            seen `min_count` times and shared from then on. Strings are
+            counted approximately in constant memory, so only repeated ones
+            take space in the shared string table.
+
+        Columns declared as 'inline' by set_schema() are always inline.
+        Leading and trailing whitespace is stripped in every mode, as it
+        always was for shared strings.
+        """
+        if mode not in STRING_MODES:
+            raise ValueError("Unknown string mode %s, use one of %s"
+                             % (mode, ", ".join(STRING_MODES)))
+        self._string_mode = mode
+        self._string_cell = self._get_string_cell(mode, min_count)
+        if self._schema is not None:
+            self.set_schema(self._schema)
+
+    def _get_string_cell(self, mode, min_count=SHARED_STRING_MIN_COUNT):
+        """Function formatting a string cell from its coordinate and value"""
+        builder = self._string_builder
+        if mode == 'shared':
+            def string_cell(coordinate, value):
+                return STRING_CELL % (coordinate, builder.add(value))
+        elif mode == 'inline':
+            def string_cell(coordinate, value):
+                return INLINE_CELL % (coordinate, _inline_text(value))
+        else:
+            count = StringCounter().add
+            def string_cell(coordinate, value):
+                index = builder.get(value)
+                if index is None:
+                    if count(value) < min_count:
+                        return INLINE_CELL % (coordinate, _inline_text(value))
+                    index = builder.add(value)
+                return STRING_CELL % (coordinate, index)
+        return string_cell
+
+    def _number_format_style(self, format_code):
+        """Id of the cell style with this number format, shared by the workbook"""
+        formats = self._parent._dump_number_formats
+        if format_code not in formats:
+            formats.append(format_code)
+        return FIRST_NUMBER_FORMAT_STYLE + formats.index(format_code)
+
+    def _get_letters(self, span):
+        letters = self._column_letters
+        if span > len(letters):
+            letters.extend(get_column_letter(idx)
+                           for idx in range(len(letters) + 1, span + 1))
+        return letters
+
+    def _row_xml(self, row, row_idx, xml):
+        """Add the xml of a row to the list `xml`"""
+        span = len(row)
+        if span > self._max_col:
+            self._max_col = span
+        if self._encoders is not None:
+            self._declared_row_xml(row, row_idx, span, xml)
+            return
+        letters = self._get_letters(span)
+        xml.append(ROW % (row_idx, span))
         for col_idx, cell in enumerate(row):
             if cell is None:
                 continue
 
-            coordinate = '%s%d' % (get_column_letter(col_idx + 1), row_idx)
-            attributes = {'r': coordinate}
-
+            coordinate = letters[col_idx] + row_idx
             if isinstance(cell, bool):
-                dtype = 'boolean'
+                xml.append(BOOLEAN_CELL % (coordinate, int(cell)))
             elif isinstance(cell, NUMERIC_TYPES):
-                dtype = 'numeric'
+                if cell != cell:
+                    # NaN from numpy
+                    continue
+                xml.append(NUMERIC_CELL % (coordinate, cell))
             elif isinstance(cell, (datetime.datetime, datetime.date)):
-                dtype = 'datetime'
-                cell = to_excel(cell)
-                attributes['s'] = STYLES[dtype]['style']
+                xml.append(DATETIME_CELL % (coordinate, to_excel(cell)))
             elif cell and cell[0] == '=':
-                dtype = 'formula'
+                xml.append(FORMULA_CELL % (coordinate, _formula_text(cell)))
             else:
-                dtype = 'string'
-                cell = self._string_builder.add(cell)
-
-            if dtype != 'formula':
-                attributes['t'] = STYLES[dtype]['type']
-            start_tag(doc, 'c', attributes)
-
-            if dtype == 'formula':
-                tag(doc, 'f', body='%s' % cell[1:])
-                tag(doc, 'v')
-            elif dtype == 'boolean':
-                tag(doc, 'v', body='%d' % cell)
+                xml.append(self._string_cell(coordinate, cell))
+        xml.append('</row>')
+
+    def _declared_row_xml(self, row, row_idx, span, xml):
+        """Format a row with the column types from set_schema()"""
+        encoders = self._encoders
+        if (self._row_template is not None and span == len(encoders)
+            and None not in row):
+            values = list(row)
+            for idx, convert in self._converters:
+                values[idx] = convert(values[idx])
+            for idx in self._number_columns:
+                if values[idx] != values[idx]:
+                    # NaN, formatted cell by cell
+                    break
             else:
-                tag(doc, 'v', body='%s' % cell)
-            end_tag(doc, 'c')
-        end_tag(doc, 'row')
+                xml.append(self._row_template.format(row_idx, *values))
+                return
+
+        letters = self._get_letters(span)
+        xml.append(ROW % (row_idx, span))
+        for col_idx, cell in enumerate(row):
+            if cell is None:
+                continue
+            coordinate = letters[col_idx] + row_idx
+            if col_idx < len(encoders):
+                xml.append(encoders[col_idx](coordinate, cell))
+            else:
+                xml.append(self._cell_xml(coordinate, cell))
+        xml.append('</row>')
+
+    def _cell_xml(self, coordinate, cell):
+        """Xml of a cell of an undeclared column, as in _row_xml()"""
+        if isinstance(cell, bool):
+            return BOOLEAN_CELL % (coordinate, int(cell))
+        elif isinstance(cell, NUMERIC_TYPES):
+            if cell != cell:
+                return ''
+            return NUMERIC_CELL % (coordinate, cell)
+        elif isinstance(cell, (datetime.datetime, datetime.date)):
+            return DATETIME_CELL % (coordinate, to_excel(cell))
+        elif cell and cell[0] == '=':
+            return FORMULA_CELL % (coordinate, _formula_text(cell))
+        return self._string_cell(coordinate, cell)
+
+    def _append_numeric(self, block):
+        """
+        Rows of a numeric numpy array are formatted with a single template,
+        rows containing NaN cell by cell
+        """
+        import numpy
+        span = block.shape[1]
+        letters = self._get_letters(span)
+        template = ''.join([ROW % ('{0}', span)] +
+                           [NUMERIC_CELL % (letters[idx] + '{0}', '{%d}' % (idx + 1))
+                            for idx in range(span)] + ['</row>'])
+        missing = None
+        if block.dtype.kind == 'f':
+            missing = numpy.isnan(block).any(axis=1)
+        for start in range(0, len(block), ROWS_PER_WRITE):
+            chunk = block[start:start + ROWS_PER_WRITE]
+            xml = []
+            for idx, row in enumerate(chunk.tolist()):
+                self._max_row += 1
+                if missing is not None and missing[start + idx]:
+                    self._row_xml(row, '%d' % self._max_row, xml)
+                else:
+                    xml.append(template.format(self._max_row, *row))
+            self._write(''.join(xml))
+        if len(block) and span > self._max_col:
+            self._max_col = span
 
 def save_dump(workbook, filename):
     writer = ExcelDumpWriter(workbook)
@@ -260,17 +529,29 @@ class ExcelDumpWriter(ExcelWriter):
         self.workbook = workbook
         self.style_writer = StyleDumpWriter(workbook)
         self.style_writer._style_list.append(DATETIME_STYLE)
+        # styles of the number formats from set_schema(), in order of their ids
+        for format_code in workbook._dump_number_formats:
+            style = Style()
+            style.number_format.format_code = format_code
+            self.style_writer._style_list.append(style)
 
     def _write_string_table(self, archive):
-        shared_string_table = self.workbook.strings_table_builder.get_table()
-        archive.writestr(ARC_SHARED_STRINGS,
-                write_string_table(shared_string_table))
-
-        return shared_string_table
+        # streamed through a temporary file like the worksheets
+        builder = self.workbook.strings_table_builder
+        filename = create_temporary_file()
+        try:
+            fobj = open(filename, 'wb')
+            try:
+                builder.write(fobj)
+            finally:
+                fobj.close()
+            archive.write(filename, ARC_SHARED_STRINGS)
+        finally:
+            os.remove(filename)
+            builder.close()
 
     def _write_worksheets(self, archive, shared_string_table, style_writer):
         for i, sheet in enumerate(self.workbook.worksheets):
-            sheet.write_header()
             sheet.close()
             archive.write(sheet.filename, PACKAGE_WORKSHEETS + '/sheet%d.xml' % (i + 1))
             for filename in sheet._temp_files:
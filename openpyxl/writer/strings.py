@@ -24,11 +24,31 @@ from __future__ import absolute_import
 
 """Write the shared string table."""
 
+import os
+from array import array
+from sys import getsizeof
+from tempfile import mkstemp
+from xml.sax.saxutils import escape
+
 # compatibility imports
 from openpyxl.compat import StringIO
 
 # package imports
 from openpyxl.xml.functions import start_tag, end_tag, tag, XMLGenerator
+from openpyxl.xml.constants import SHEET_MAIN_NS
+
+STRING_BUILDER_MEMORY = 64 * 1024 * 1024
+# bytes of a dictionary entry and its index, besides the string itself
+ENTRY_SIZE = 100
+# part of the memory of SqliteStringTableBuilder for the filter of the
+# strings on disk
+FILTER_SHARE = 4
+# strings written to the xml at once
+STRINGS_PER_WRITE = 1000
+
+SST = '<?xml version="1.0" encoding="utf-8"?>\n<sst xmlns="%s" uniqueCount="%d">'
+SI = '<si><t>%s</t></si>'
+PRESERVED_SI = '<si><t xml:space="preserve">%s</t></si>'
 
 
 def create_string_table(workbook):
@@ -63,6 +83,26 @@ def write_string_table(string_table):
     temp_buffer.close()
     return string_table_xml
 
+
+def stream_string_table(strings, count, fobj):
+    """
+    Write the xml of `count` strings, in the order of their indices, to the
+    binary file `fobj` without building it in memory
+    """
+    fobj.write((SST % (SHEET_MAIN_NS, count)).encode('utf-8'))
+    xml = []
+    for key in strings:
+        if key.strip() != key:
+            xml.append(PRESERVED_SI % escape(key))
+        else:
+            xml.append(SI % escape(key))
+        if len(xml) == STRINGS_PER_WRITE:
+            fobj.write(''.join(xml).encode('utf-8'))
+            xml = []
+    xml.append('</sst>')
+    fobj.write(''.join(xml).encode('utf-8'))
+
+
 class StringTableBuilder(object):
 
     def __init__(self):
@@ -80,6 +120,173 @@ class StringTableBuilder(object):
             self.counter += 1
             return res
 
+    def get(self, key):
+        """Index of a string already in the table or None"""
+        return self.dct.get(key.strip())
+
     def get_table(self):
 
         return self.dct
+
+    def write(self, fobj):
+        """Write the xml of the table to the binary file `fobj`"""
+        strings = sorted(self.dct, key=self.dct.get)
+        stream_string_table(strings, len(strings), fobj)
+
+    def close(self):
+        pass
+
+
+class SqliteStringTableBuilder(StringTableBuilder):
+    """
+    Shared strings of the optimized writer in bounded memory. Once the
+    strings in memory take more than their part of `memory` bytes they are
+    moved to a temporary sqlite database, which is looked up for strings not
+    in memory. Strings found there are kept in memory again until the next
+    move.
+
+    A Bloom filter of the strings on disk, in the rest of the memory, saves
+    looking up most new strings.
+    """
+
+    def __init__(self, memory=STRING_BUILDER_MEMORY):
+        super(SqliteStringTableBuilder, self).__init__()
+        self._filter = bytearray(max(memory // FILTER_SHARE, 1))
+        self._filter_bits = len(self._filter) * 8
+        self.memory = memory - len(self._filter)
+        self.size = 0
+        self.path = None
+        self._db = None
+
+    def add(self, key):
+        key = key.strip()
+        try:
+            return self.dct[key]
+        except KeyError:
+            pass
+        res = self._lookup(key)
+        if res is None:
+            res = self.counter
+            self.counter += 1
+        self.dct[key] = res
+        self.size += getsizeof(key) + ENTRY_SIZE
+        if self.size > self.memory:
+            self._spill()
+        return res
+
+    def get(self, key):
+        key = key.strip()
+        res = self.dct.get(key)
+        if res is None:
+            res = self._lookup(key)
+        return res
+
+    def _probes(self, key):
+        h = hash(key)
+        bits = self._filter_bits
+        return h % bits, (h >> 32) % bits
+
+    def _lookup(self, key):
+        if self._db is None:
+            return
+        bloom = self._filter
+        for bit in self._probes(key):
+            if not bloom[bit >> 3] & (1 << (bit & 7)):
+                return
+        row = self._db.execute("SELECT id FROM strings WHERE value = ?",
+                               (key,)).fetchone()
+        if row is not None:
+            return row[0]
+
+    def _spill(self):
+        """Move the strings in memory to the database"""
+        if self._db is None:
+            try:
+                import sqlite3
+            except ImportError:
+                raise ImportError('You must have sqlite3 to store shared strings on disk')
+            fd, self.path = mkstemp(suffix='.sqlite', prefix='openpyxl.')
+            os.close(fd)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            # a temporary database does not need to survive a crash
+            self._db.execute("PRAGMA synchronous = OFF")
+            self._db.execute("PRAGMA journal_mode = OFF")
+            self._db.execute("CREATE TABLE strings "
+                             "(id INTEGER PRIMARY KEY, value TEXT UNIQUE)")
+        bloom = self._filter
+        for key in self.dct:
+            for bit in self._probes(key):
+                bloom[bit >> 3] |= 1 << (bit & 7)
+        # strings read back from the database are already there
+        self._db.executemany("INSERT OR IGNORE INTO strings VALUES (?, ?)",
+                             ((res, key) for key, res in self.dct.items()))
+        self._db.commit()
+        self.dct = {}
+        self.size = 0
+
+    def get_table(self):
+        """All the strings and their indices, read into memory"""
+        if self._db is None:
+            return self.dct
+        self._spill()
+        return dict(self._db.execute("SELECT value, id FROM strings"))
+
+    def write(self, fobj):
+        if self._db is None:
+            return super(SqliteStringTableBuilder, self).write(fobj)
+        self._spill()
+        strings = (row[0] for row in
+                   self._db.execute("SELECT value FROM strings ORDER BY id"))
+        stream_string_table(strings, self.counter, fobj)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+STRING_COUNTER_WIDTH = 2 ** 16
+STRING_COUNTER_DEPTH = 4
+
+class StringCounter(object):
+    """
+    Approximate number of times strings were added, in constant memory.
+
+    This is a count-min sketch: collisions can make counts too high, never
+    too low. The counts start again from zero every `width` additions, so a
+    string only counts as repeated within that many strings.
+    """
+
+    def __init__(self, width=STRING_COUNTER_WIDTH, depth=STRING_COUNTER_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.clear()
+
+    def clear(self):
+        self._counts = [array('I', [0]) * self.width for _ in range(self.depth)]
+        self._added = 0
+
+    def add(self, key):
+        """Count `key` and return its count so far"""
+        if self._added == self.width:
+            self.clear()
+        self._added += 1
+        width = self.width
+        h = hash(key)
+        step = (h >> 16) | 1
+        count = None
+        for counts in self._counts:
+            idx = h % width
+            value = counts[idx] = counts[idx] + 1
+            if count is None or value < count:
+                count = value
+            h += step
+        return count
@@ -36,7 +36,7 @@ from xml.sax.xmlreader import AttributesImpl
 
 
 # compatibility
-from openpyxl.compat import OrderedDict
+from openpyxl.compat import OrderedDict, basestring
 
 # package imports
 from openpyxl import LXML
@@ -49,9 +49,7 @@ if LXML is True:
     fromstring,
     tostring,
     register_namespace,
-    iterparse
     )
-    from xml.etree.cElementTree import iterparse
 else:
     try:
         from xml.etree.cElementTree import (
@@ -60,7 +58,6 @@ else:
         SubElement,
         fromstring,
         tostring,
-        iterparse
         )
     except ImportError:
         from xml.etree.ElementTreee import (
@@ -69,10 +66,20 @@ else:
         SubElement,
         fromstring,
         tostring,
-        iterparse
         )
     from .namespace import register_namespace
 
+try:
+    from xml.etree.cElementTree import (
+        iterparse as _etree_iterparse,
+        tostring as _etree_tostring
+    )
+except ImportError:
+    from xml.etree.ElementTree import (
+        iterparse as _etree_iterparse,
+        tostring as _etree_tostring
+    )
+
 from openpyxl.xml.constants import (
     CHART_NS,
     DRAWING_NS,
@@ -86,12 +93,69 @@ from openpyxl.xml.constants import (
     DCTERMS_PREFIX
 )
 
-# allow LXML interface
-_iterparse = iterparse
-def safe_iterparse(source, *args, **kw):
-    return _iterparse(source)
+class ElementTreeEngine(object):
+    """Incremental parsing with the standard library"""
+
+    name = 'etree'
+
+    def iterparse(self, source, tag=None, remove_blank_text=False,
+                  events=('end',)):
+        it = _etree_iterparse(source, events)
+        if tag is None:
+            return it
+        if isinstance(tag, basestring):
+            tag = [tag]
+        tags = frozenset(tag)
+        return ((event, element) for event, element in it if element.tag in tags)
+
+    def tostring(self, element):
+        return _etree_tostring(element)
+
+
+class LxmlEngine(object):
+    """Incremental parsing with lxml, which filters tags in C"""
+
+    name = 'lxml'
+
+    def iterparse(self, source, tag=None, remove_blank_text=False,
+                  events=('end',)):
+        from lxml.etree import iterparse
+        return iterparse(source, events=events, tag=tag,
+                         remove_blank_text=remove_blank_text)
+
+    def tostring(self, element):
+        return tostring(element)
 
-iterparse = safe_iterparse
+
+ENGINES = {'etree': ElementTreeEngine()}
+if LXML is True:
+    ENGINES['lxml'] = LxmlEngine()
+
+# lxml parses faster but creating proxies for the elements it returns
+# outweighs that when every cell is looked at, see benchmarks/parser.py
+DEFAULT_ENGINE = 'etree'
+
+
+def get_engine(name=None):
+    """Return the parser engine called `name`, or the default one"""
+    if name is None:
+        name = DEFAULT_ENGINE
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError("Unknown xml engine {0}, use one of {1}".format(
+            name, ", ".join(sorted(ENGINES))))
+
+
+def iterparse(source, tag=None, remove_blank_text=False, events=('end',),
+              engine=None):
+    """
+    Parse `source` incrementally and yield (event, element) for elements
+    with one of the tags in `tag`, or for every element if it is None.
+
+    :param engine: 'lxml' or 'etree', `DEFAULT_ENGINE` if None
+    """
+    return get_engine(engine).iterparse(source, tag, remove_blank_text, events)
 
 
 register_namespace(DCTERMS_PREFIX, DCTERMS_NS)
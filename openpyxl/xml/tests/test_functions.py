@@ -31,3 +31,32 @@ def test_dict_attrib(root):
 def test_no_tag(root, condition):
     ConditionalElement(root, "start", condition)
     assert root.find("start") is None
+
+
+from openpyxl.xml.functions import ENGINES
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_iterparse_tag(engine):
+    from openpyxl.compat import BytesIO
+    from openpyxl.xml.functions import iterparse
+    xml = b"<root><a>1</a><b><a>2</a></b><c/></root>"
+    it = iterparse(BytesIO(xml), tag=['a', 'c'], engine=engine)
+    assert [(el.tag, el.text) for event, el in it] == [('a', '1'), ('a', '2'), ('c', None)]
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_iterparse_start(engine):
+    from openpyxl.compat import BytesIO
+    from openpyxl.xml.functions import iterparse
+    xml = b'<root><a n="1"><b/></a></root>'
+    it = iterparse(BytesIO(xml), tag='a', events=('start',), engine=engine)
+    event, element = next(it)
+    assert event == 'start'
+    assert element.get('n') == '1'
+
+
+def test_unknown_engine():
+    from openpyxl.xml.functions import get_engine
+    with pytest.raises(ValueError):
+        get_engine("sax")